@@ -0,0 +1,28 @@
+"""
+Shared timing helpers for the dev/optimization benchmark scripts.
+
+Each call is timed on its own with timeit.repeat(number=1), with the
+garbage collector off (timeit's default).  The result is summarised by
+its minimum and percentiles rather than mean +/- std: JIT and OS noise
+skew the timing distribution to the right.
+"""
+
+import timeit
+
+import numpy as np
+
+
+def time_call(func, repeat=20):
+    """Run func() `repeat` times; return the per-call times (s) as an array.
+
+    timeit disables gc around the timed statement.  Warm up (JIT-compile)
+    func before calling this, so that compilation is not timed.
+    """
+    return np.array(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def summarize(times):
+    """One-line min / p50 / p90 / max summary of an array of times (s)."""
+    p50, p90 = np.percentile(times, [50, 90])
+    return (f"min={times.min():.4f}s  p50={p50:.4f}s  p90={p90:.4f}s  "
+            f"max={times.max():.4f}s  (n={times.size})")
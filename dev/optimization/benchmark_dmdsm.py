@@ -2,6 +2,13 @@
 """
 Benchmark dmdsm_dm2d with multiple calls to measure amortized JIT speedup.
 First run is slow (JIT compilation), subsequent runs are fast (compiled code).
+
+The density kernels are compiled with cache=True, so the compiled code is
+written to __pycache__ and reused by later processes.  To keep compilation
+out of the "first call" timing, warm the cache once beforehand:
+
+    python -c "from mwprop.nemod.density_components import ne_outer_vec, ne_inner_vec; \
+               import numpy as np; a = np.zeros(2); ne_outer_vec(a, a, a); ne_inner_vec(a, a, a)"
 """
 
 import numpy as np
@@ -9,6 +16,8 @@ import time
 import sys
 import os
 
+from _timing import time_call, summarize
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
@@ -30,7 +39,7 @@ print()
 
 # First call (includes JIT compilation time)
 print("FIRST CALL (includes JIT compilation)...")
-t0 = time.time()
+t0 = time.perf_counter()
 l, b, dm = test_cases[0]
 limit, dist, dm_calc, sm, smtau, smtheta, smiso = dmdsm_dm2d(
     l, b, dm,
@@ -40,36 +49,29 @@ limit, dist, dm_calc, sm, smtau, smtheta, smiso = dmdsm_dm2d(
     verbose=False,
     debug=False
 )
-t1 = time.time()
+t1 = time.perf_counter()
 first_call_time = t1 - t0
 print(f"  Time: {first_call_time:.4f}s (includes JIT compilation)")
 print(f"  Result: d={dist:.2f} kpc, DM={dm_calc:.2f} pc/cm³")
 print()
 
 # Subsequent calls (only execution time, JIT already compiled)
-print("SUBSEQUENT CALLS (JIT already compiled)...")
-times = []
+print("SUBSEQUENT CALLS (JIT already compiled, min of 20 timeit repeats)...")
+best = []
 for i, (l, b, dm) in enumerate(test_cases[1:], 1):
-    t0 = time.time()
-    limit, dist, dm_calc, sm, smtau, smtheta, smiso = dmdsm_dm2d(
-        l, b, dm,
-        dm2d_only=False,
-        do_analysis=False,
-        plotting=False,
-        verbose=False,
-        debug=False
-    )
-    t1 = time.time()
-    elapsed = t1 - t0
-    times.append(elapsed)
-    print(f"  Call {i}: {elapsed:.4f}s - d={dist:.2f} kpc, DM={dm_calc:.2f}")
+    run = lambda: dmdsm_dm2d(l, b, dm, dm2d_only=False, do_analysis=False,
+                             plotting=False, verbose=False, debug=False)
+    limit, dist, dm_calc, sm, smtau, smtheta, smiso = run()
+    times = time_call(run, repeat=20)
+    best.append(times.min())
+    print(f"  Call {i}: {summarize(times)} - d={dist:.2f} kpc, DM={dm_calc:.2f}")
 
 print()
 print("=" * 80)
 print("SUMMARY")
 print("=" * 80)
-avg_compiled_time = np.mean(times)
+best_compiled_time = np.median(best)
 print(f"First call (with JIT): {first_call_time:.4f}s")
-print(f"Average compiled call: {avg_compiled_time:.4f}s (n={len(times)})")
-print(f"First call overhead:   {first_call_time - avg_compiled_time:.4f}s")
-print(f"Speedup ratio:         {first_call_time / avg_compiled_time:.2f}×")
+print(f"Compiled call (median over cases of per-case min): {best_compiled_time:.4f}s")
+print(f"First call overhead:   {first_call_time - best_compiled_time:.4f}s")
+print(f"Speedup ratio:         {first_call_time / best_compiled_time:.2f}×")
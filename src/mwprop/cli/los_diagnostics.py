@@ -250,7 +250,7 @@ def main():
 
         # Get individual electron density contributions
         nea_vec[n], Fvec[n], Armvec[n] = \
-            ne_arms.ne_arms_ne2001p(x ,yvec[n], zvec[n], Ncoarse=Ncoarse, verbose=False)
+            ne_arms.ne_arms_ne2001p(x ,yvec[n], zvec[n], verbose=False)
         ne1_vec[n] = dc.ne_outer(x, yvec[n], zvec[n])[0]
         ne2_vec[n] = dc.ne_inner(x, yvec[n], zvec[n])[0]
         negc_vec[n] = dc.ne_gc(x, yvec[n], zvec[n])[0]
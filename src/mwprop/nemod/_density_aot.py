@@ -0,0 +1,39 @@
+# mwprop v2.0 Jan 2026
+
+"""
+Ahead-of-time build of the smooth-component density kernels.
+
+Compiles the scalar kernels of density_components with numba.pycc into an
+extension module `density_aot` placed next to this file:
+
+    python -m mwprop.nemod._density_aot
+
+The extension needs no numba (or LLVM) at run time.  density_components
+picks it up when numba is *not* installed, so those installs get compiled
+ne_outer/ne_inner/ne_all_comps instead of the pure-Python fallback; with
+numba present the JIT dispatchers (and their on-disk cache) are used, since
+AOT functions cannot be called from other njit code.
+
+Building requires numba; the signatures below are float64 scalars only.
+"""
+
+import os
+
+from numba.pycc import CC
+
+from mwprop.nemod.density_components import (
+    _ne_outer_jit, _ne_inner_jit, ne_all_comps_jit,
+)
+
+cc = CC('density_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('ne_outer_kernel', 'f8(f8, f8, f8, f8, f8, f8, f8)')(
+    _ne_outer_jit.py_func)
+cc.export('ne_inner_kernel', 'f8(f8, f8, f8, f8, f8, f8)')(
+    _ne_inner_jit.py_func)
+cc.export('ne_all_comps_kernel', 'UniTuple(f8, 4)(' + ', '.join(['f8']*17) + ')')(
+    ne_all_comps_jit.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
@@ -42,6 +42,7 @@ from mwprop.get_constants_waveprop_scipy_version import *
 
 # Get parameter input
 from mwprop.nemod import ne_input
+from mwprop.nemod.numba_compat import njit
 
 # get some additional units from astropy
 from astropy import units as u
@@ -57,7 +58,32 @@ zeros = np.zeros
 
 deg2rad = np.deg2rad
 rad2deg = np.rad2deg
-sech2 = lambda z: 4.0 * np.exp(-2.0 * np.abs(z)) / (1.0 + np.exp(-2.0 * np.abs(z)))**2
+
+@njit(cache=True)
+def sech2(z):  # pragma: no cover
+    """
+    sech(z)**2 = (2e/(1 + e**2))**2 with e = exp(-|z|): one exp, no overflow.
+    Takes a scalar or an array; the compiled density kernels call it too.
+    """
+    e = np.exp(-np.abs(z))
+    t = 2.0 * e / (1.0 + e * e)
+    return t * t
+
+def stack_coords(x, y, z):
+    """
+    Positions x, y, z as one C-contiguous (3, N) float64 array, the layout
+    the array density kernels take.  If x, y, z are already the rows of
+    such an array (as from dmdsm.calc_galcentric_vecs) it is returned
+    as is; otherwise they are copied into a new one.
+    """
+    base = getattr(x, 'base', None)
+    if (isinstance(base, np.ndarray) and base.dtype == np.float64
+            and base.flags.c_contiguous and base.shape == (3, len(x))
+            and all(isinstance(a, np.ndarray) and a.base is base
+                    and a.ctypes.data == base[k].ctypes.data
+                    for k, a in enumerate((x, y, z)))):
+        return base
+    return np.ascontiguousarray(np.stack((x, y, z)), dtype=np.float64)
 
 
 # Solar system to Galactic center distance (kpc) set here
@@ -83,6 +109,27 @@ linner = 1000           # km
 ds_fine = 0.0025 # SKO 3/2/22 -- changed from 0.01, reduces discrepancies from Fortran version
 ds_coarse = 0.1
 
+class ArmMap(dict):
+    """
+    Darmmap: sequential arm index (int) -> TC93 arm number.
+
+    Keys are ints; string keys ('0', '1', ...) from older code are
+    accepted and converted.
+    """
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            key = int(key)
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            key = int(key)
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
 def setup_spiral_arms(Ncoarse=20, narmpoints=500, drfine=0.01):
     """
     Sets up spiral arm arrays to be done once per call to NE20x package.
@@ -112,9 +159,7 @@ def setup_spiral_arms(Ncoarse=20, narmpoints=500, drfine=0.01):
         # which is from GC outwards toward Sun.
 
         armmap = np.array([1, 3, 4, 2, 5])
-        Darmmap = {}
-        for j in range(narms):
-            Darmmap[str(j)] = armmap[j]
+        Darmmap = ArmMap((j, armmap[j]) for j in range(narms))
 
         """
         First evaluate spiral arms on a coarse grid of size Ncoarse
@@ -473,6 +518,11 @@ cc12 = c1*c2
 ss12 = s1*s2
 cs21 = c2*s1
 cs12 = c1*s2
+# Rotation coefficients divided by the void axes, so that
+# q = u**2 + v**2 + w**2 with u = rv11*dx + rv12*dy + rv13*dz, etc.
+rv11, rv12, rv13 = cc12/aav, s2/aav, cs21/aav
+rv21, rv22, rv23 = -cs12/bbv, c2/bbv, -ss12/bbv
+rv31, rv33 = -s1/ccv, c1/ccv
 
 
 def set_model(model: str):
@@ -496,6 +546,7 @@ def set_model(model: str):
     global nclumps, lc, bc, nec, Fc, dc, rc, edgec, slc, clc, sbc, cbc, xc, yc, zc, rcmult
     global nvoids, lv, bv, dv, nev, Fv, aav, bbv, ccv, thvy, thvz, edgev
     global slv, clv, sbv, cbv, xv, yv, zv, s1, c1, s2, c2, cc12, ss12, cs21, cs12
+    global rv11, rv12, rv13, rv21, rv22, rv23, rv31, rv33
 
     model_key = model.lower().strip()
     if model_key not in ('ne2001', 'ne2025'):
@@ -664,6 +715,9 @@ def set_model(model: str):
     ss12 = s1*s2
     cs21 = c2*s1
     cs12 = c1*s2
+    rv11, rv12, rv13 = cc12/aav, s2/aav, cs21/aav
+    rv21, rv22, rv23 = -cs12/bbv, c2/bbv, -ss12/bbv
+    rv31, rv33 = -s1/ccv, c1/ccv
 
     _refresh_dependent_modules()
 
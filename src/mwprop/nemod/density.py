@@ -85,16 +85,21 @@ def density_2001(x, y, z, inds_relevant=None, verbose=False):
     wlism=wldr=wlhb=wlsb=wloopI = hitclump = hitvoid = wvoid = whicharm = 0
 
 
+    # Thick disk, thin disk and GC come from one fused kernel evaluation,
+    # made only if at least one of them is switched on
+    if wg1 == 1 or wg2 == 1 or wggc == 1:
+        ne1_x, F1_x, ne2_x, F2_x, negc_x, Fgc_x = ne_all_comps(x,y,z)
+
     if wg1 == 1:
-        ne1, F1 = ne_outer(x,y,z)
+        ne1, F1 = ne1_x, F1_x
     if wg2 == 1:
-        ne2, F2 = ne_inner(x,y,z)
+        ne2, F2 = ne2_x, F2_x
     if wga == 1:
-        nea, Fa, whicharm = ne_arms_ne2001p(x,y,z, Ncoarse=Ncoarse)
+        nea, Fa, whicharm = ne_arms_ne2001p(x,y,z)
     else:
         nea = Fa = 0.
     if wggc == 1:
-        negc, Fgc = ne_gc(x,y,z)
+        negc, Fgc = negc_x, Fgc_x
     if wglism == 1:
         nelism, Flism, wlism, wldr, wlhb, wlsb, wloopI = ne_lism(x,y,z)
     if wgcN == 1:
@@ -213,7 +218,7 @@ def density_2001_smooth_comps(x, y, z, verbose=False):
     if wg2 == 1:
         ne2, F2 = ne_inner(x,y,z)
     if wga == 1:
-        nea, Fa, whicharm = ne_arms_ne2001p(x,y,z, Ncoarse=Ncoarse)
+        nea, Fa, whicharm = ne_arms_ne2001p(x,y,z)
 
     if verbose:
         print('density: ', ne1, ne2, F1, F2)
@@ -326,8 +331,7 @@ def density_2001_smooth_comps_vec(xvec, yvec, zvec):
     if wg2 == 1:
         ne2_v, F2_v = ne_inner_vec(xvec, yvec, zvec)
     if wga == 1:
-        nea_v, Fa_v, whicharm_v = ne_arms_ne2001p_vec(xvec, yvec, zvec,
-                                                       Ncoarse=Ncoarse)
+        nea_v, Fa_v, whicharm_v = ne_arms_ne2001p_vec(xvec, yvec, zvec)
 
     wne1 = wg1 * ne1_v
     wne2 = wg2 * ne2_v
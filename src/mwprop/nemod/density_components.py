@@ -19,54 +19,170 @@ Change Log:
     * other parameters and function defs also now in config file
 '''
 
+import math
 import numpy as np
 
 # nemod_config sets up the model with all dictionaries etc.
 from mwprop.nemod.config_nemod import *
-from mwprop.nemod.numba_compat import njit, HAS_NUMBA
+from mwprop.nemod.numba_compat import njit, prange, HAS_NUMBA
 
 pihalf = np.pi/2.
-sqrt = np.sqrt
-
-@njit
-def _ne_outer_jit(x, y, z, rsun, A1, n1h1, h1, F1, pihalf, sech2_const):  # pragma: no cover
-    """JIT-compiled ne_outer core calculation"""
-    rr = sqrt(x**2 + y**2)
-    suncos = np.cos(pihalf*rsun/A1)
+sqrt = np.sqrt      # kept for star-importers; scalar kernels use math.*
+
+# 1/(1.8 kpc)**2: inverse squared radial width of the thin-disk annulus
+_INV_WIDTH2 = 1.0/(1.8*1.8)
+
+# Thick-disk constants of the model: cos(pi/2 * rsun/A1) normalisation and
+# midplane density n1h1/h1.  Recomputed when set_model() reloads the module.
+_SUNCOS = np.cos(pihalf*rsun/A1)
+_SUNCOS_INV = 1.0/_SUNCOS
+_N1H1_OVER_H1 = n1h1/h1
+
+# Kernels take every model parameter as an argument, so the on-disk Numba
+# cache (cache=True) stays valid across set_model() switches.
+
+# cos(t) on [0, pi/2] as a degree-7 polynomial in s = t*t (Chebyshev fit in
+# s over [0, (pi/2)**2], converted to power form); max abs. error 3e-15.
+# Only valid on that range, which is all ne_outer needs (rr <= A1).
+_COS_C0 = 0.9999999999999989
+_COS_C1 = -0.49999999999989986
+_COS_C2 = 0.04166666666579505
+_COS_C3 = -0.001388888886051475
+_COS_C4 = 2.4801582786991336e-05
+_COS_C5 = -2.755692966108928e-07
+_COS_C6 = 2.085812709847018e-09
+_COS_C7 = -1.1005527076306548e-11
+
+@njit(inline='always', fastmath=True, boundscheck=False, error_model='numpy')
+def _cos_cheb(t):  # pragma: no cover
+    """cos(t) for 0 <= t <= pi/2 by polynomial (Horner form in t*t)"""
+    s = t*t
+    return (((((((_COS_C7*s + _COS_C6)*s + _COS_C5)*s + _COS_C4)*s
+              + _COS_C3)*s + _COS_C2)*s + _COS_C1)*s + _COS_C0)
+
+@njit(cache=True, fastmath=True, boundscheck=False, error_model='numpy')
+def _ne_outer_jit(x, y, z, A1, h1, suncos_inv, n1h1_over_h1):  # pragma: no cover
+    """JIT-compiled ne_outer core calculation; returns ne1 only (F1 is constant)"""
+    rr = math.sqrt(x*x + y*y)
     if rr > A1:
         g1 = 0.
     else:
-        g1 = np.cos(pihalf*rr/A1)/suncos
-    # sech2(z/h1) ≈ 4*exp(-2*|z/h1|) / (1 + exp(-2*|z/h1|))^2
-    z_arg = np.abs(z/h1)
-    exp_2z = np.exp(-2.0*z_arg)
-    sech2_val = 4.0 * exp_2z / (1.0 + exp_2z)**2
-    ne1 = (n1h1/h1) * g1 * sech2_val
-    return ne1, F1
-
-@njit
-def _ne_inner_jit(x, y, z, A2, n2, h2, F2, sech2_const):  # pragma: no cover
-    """JIT-compiled ne_inner core calculation"""
+        g1 = _cos_cheb(pihalf*rr/A1)*suncos_inv
+    sech2_val = sech2(z/h1)
+    ne1 = n1h1_over_h1 * g1 * sech2_val
+    return ne1
+
+@njit(cache=True, fastmath=True, boundscheck=False, error_model='numpy')
+def _ne_inner_jit(x, y, z, A2, n2, h2):  # pragma: no cover
+    """JIT-compiled ne_inner core calculation; returns ne2 only (F2 is constant)"""
     g2 = 0.
-    rr = sqrt(x**2. + y**2.)
-    rrarg = ((rr-A2)/1.8)**2.
+    rr = math.sqrt(x*x + y*y)
+    drr = rr - A2
+    rrarg = drr*drr*_INV_WIDTH2
     if rrarg < 10.:
-        g2 = np.exp(-rrarg)
-    # sech2(z/h2)
-    z_arg = np.abs(z/h2)
-    exp_2z = np.exp(-2.0*z_arg)
-    sech2_val = 4.0 * exp_2z / (1.0 + exp_2z)**2
+        g2 = math.exp(-rrarg)
+    sech2_val = sech2(z/h2)
     ne2 = n2 * g2 * sech2_val
-    return ne2, F2
+    return ne2
+
+@njit(parallel=True, cache=True, fastmath=True, boundscheck=False,
+      error_model='numpy')
+def _ne_outer_arr_jit(coords, out, A1, h1, suncos_inv, n1h1_over_h1):  # pragma: no cover
+    """JIT-compiled ne_outer over (3, N) LoS coordinates; fills out in place"""
+    for i in prange(coords.shape[1]):
+        out[i] = _ne_outer_jit(coords[0, i], coords[1, i], coords[2, i],
+                               A1, h1, suncos_inv, n1h1_over_h1)
+
+@njit(parallel=True, cache=True, fastmath=True, boundscheck=False,
+      error_model='numpy')
+def _ne_inner_arr_jit(coords, out, A2, n2, h2):  # pragma: no cover
+    """JIT-compiled ne_inner over (3, N) LoS coordinates; fills out in place"""
+    for i in prange(coords.shape[1]):
+        out[i] = _ne_inner_jit(coords[0, i], coords[1, i], coords[2, i],
+                               A2, n2, h2)
+
+@njit(cache=True, fastmath=True, boundscheck=False, error_model='numpy')
+def _ne_gc_jit(x, y, z, xgc, ygc, zgc, rgc, hgc, negc0, Fgc0, absymax):  # pragma: no cover
+    """JIT-compiled ne_gc core calculation; branchless mask instead of early exits"""
+    dx = x - xgc
+    dy = y - ygc
+    rr = math.sqrt(dx*dx + dy*dy)               #galactocentric radius
+    zz = abs(z-zgc)                             #z-height
+    inside = (abs(y) <= absymax) & (rr <= rgc) & (zz <= hgc)
+    rr_n = rr/rgc
+    zz_n = zz/hgc
+    arg = rr_n*rr_n + zz_n*zz_n
+    hit = inside & (arg <= 1.)
+    ne_gc_out = negc0 if hit else 0.
+    F_gc = Fgc0 if hit else 0.
+    return ne_gc_out, F_gc
+
+@njit(cache=True, fastmath=True, boundscheck=False, error_model='numpy')
+def ne_all_comps_jit(x, y, z, A1, h1, suncos_inv, n1h1_over_h1,
+                     A2, n2, h2, xgc, ygc, zgc, rgc, hgc, negc0, Fgc0):  # pragma: no cover
+    """
+    JIT-compiled ne_outer + ne_inner + ne_gc in one pass.
+
+    The cylindrical radius and |z| are computed once and shared by the
+    thick and thin disks; selections are flat conditional expressions
+    rather than early returns.
+
+    Returns (ne1, ne2, ne_gc, F_gc); F1 and F2 are model constants and
+    are not carried through the kernel.
+    """
+    rr = math.sqrt(x*x + y*y)
+    az = abs(z)
+
+    # Thick disk (ne_outer)
+    g1 = _cos_cheb(pihalf*rr/A1)*suncos_inv if rr <= A1 else 0.
+    ne1 = n1h1_over_h1 * g1 * sech2(az/h1)
+
+    # Thin disk (ne_inner)
+    drr = rr - A2
+    rrarg = drr*drr*_INV_WIDTH2
+    g2 = math.exp(-rrarg) if rrarg < 10. else 0.
+    ne2 = n2 * g2 * sech2(az/h2)
+
+    # Galactic center (ne_gc)
+    ne_gc_out, F_gc = _ne_gc_jit(x, y, z, xgc, ygc, zgc, rgc, hgc, negc0, Fgc0,
+                                 2*rgc)
+
+    return ne1, ne2, ne_gc_out, F_gc
+
+# Without numba, use the ahead-of-time compiled kernels if they have been
+# built (python -m mwprop.nemod._density_aot); otherwise the plain Python
+# definitions above are used as-is.
+if not HAS_NUMBA:
+    try:
+        from mwprop.nemod import density_aot as _aot
+    except ImportError:
+        _aot = None
+    if _aot is not None:
+        _ne_outer_jit = _aot.ne_outer_kernel
+        _ne_inner_jit = _aot.ne_inner_kernel
+        ne_all_comps_jit = _aot.ne_all_comps_kernel
+
+def ne_all_comps(x, y, z):
+    """
+    Thick disk, thin disk and Galactic center densities at (x,y,z) from a
+    single fused kernel.  Same values as calling ne_outer, ne_inner and
+    ne_gc in turn.
+
+    Returns (ne1, F1, ne2, F2, ne_gc, F_gc).
+    """
+    ne1, ne2, ne_gc_out, F_gc = ne_all_comps_jit(
+        x, y, z, A1, h1, _SUNCOS_INV, _N1H1_OVER_H1, A2, n2, h2,
+        xgc, ygc, zgc, rgc, hgc, negc0, Fgc0)
+    return ne1, F1, ne2, F2, ne_gc_out, F_gc
 
 def ne_outer(x,y,z): #thick disk component
 
     #g1 = sech2(rr/A1)/sech2(rsun/A1) #TC93 function
-    return _ne_outer_jit(x, y, z, rsun, A1, n1h1, h1, F1, pihalf, None)
+    return _ne_outer_jit(x, y, z, A1, h1, _SUNCOS_INV, _N1H1_OVER_H1), F1
 
 def ne_inner(x,y,z): #thin disk component
 
-    return _ne_inner_jit(x, y, z, A2, n2, h2, F2, None)
+    return _ne_inner_jit(x, y, z, A2, n2, h2), F2
 
 def ne_gc(x,y,z, absymax=2*rgc):
 
@@ -112,26 +228,10 @@ def ne_gc(x,y,z, absymax=2*rgc):
     '''
 
     # GC component is nonzero only for abs(y) < rgc (currently)
-    # so conservatively exit function for abs(y) > absymax = multiple of rgc:
-
-    if abs(y) > absymax:
-        return 0, 0
+    # so conservatively zero it for abs(y) > absymax = multiple of rgc.
+    # All tests are combined into one mask (no early returns):
 
-    rr = sqrt((x-xgc)**2. + (y-ygc)**2.)        #galactocentric radius
-    zz = abs(z-zgc)                             #z-height
-
-    if rr > rgc or abs(z-zgc) > hgc:
-        return 0, 0
-    else:
-        arg = (rr/rgc)**2. + (zz/hgc)**2.
-        if arg <= 1:
-            ne_gc_out = negc0
-            F_gc = Fgc0
-        else: # need this to avoid errors when arg is not <=1
-            ne_gc_out = 0
-            F_gc = 0
-
-    return ne_gc_out, F_gc
+    return _ne_gc_jit(x, y, z, xgc, ygc, zgc, rgc, hgc, negc0, Fgc0, absymax)
 
 
 # ---------------------------------------------------------------------------
@@ -151,23 +251,125 @@ def ne_gc_vec(x, y, z, absymax=2*rgc):
 
 def ne_outer_vec(x, y, z):
     """Vectorized (array) version of ne_outer.  x, y, z are 1-D numpy arrays."""
+    if HAS_NUMBA:
+        ne1 = np.empty(len(x))
+        _ne_outer_arr_jit(stack_coords(x, y, z), ne1, A1, h1, _SUNCOS_INV,
+                          _N1H1_OVER_H1)
+        return ne1, np.full_like(ne1, F1)
+
     rr = np.sqrt(x**2 + y**2)
-    suncos = np.cos(pihalf * rsun / A1)
-    g1 = np.where(rr > A1, 0.0, np.cos(pihalf * rr / A1) / suncos)
-    z_arg = np.abs(z / h1)
-    exp_2z = np.exp(-2.0 * z_arg)
-    sech2_val = 4.0 * exp_2z / (1.0 + exp_2z)**2
-    ne1 = (n1h1 / h1) * g1 * sech2_val
+    g1 = np.where(rr > A1, 0.0, np.cos(pihalf * rr / A1) * _SUNCOS_INV)
+    sech2_val = sech2(z / h1)
+    ne1 = _N1H1_OVER_H1 * g1 * sech2_val
     return ne1, np.full_like(ne1, F1)
 
 
 def ne_inner_vec(x, y, z):
     """Vectorized (array) version of ne_inner.  x, y, z are 1-D numpy arrays."""
+    if HAS_NUMBA:
+        ne2 = np.empty(len(x))
+        _ne_inner_arr_jit(stack_coords(x, y, z), ne2, A2, n2, h2)
+        return ne2, np.full_like(ne2, F2)
+
     rr = np.sqrt(x**2 + y**2)
     rrarg = ((rr - A2) / 1.8)**2
     g2 = np.where(rrarg < 10.0, np.exp(-rrarg), 0.0)
-    z_arg = np.abs(z / h2)
-    exp_2z = np.exp(-2.0 * z_arg)
-    sech2_val = 4.0 * exp_2z / (1.0 + exp_2z)**2
+    sech2_val = sech2(z / h2)
     ne2 = n2 * g2 * sech2_val
     return ne2, np.full_like(ne2, F2)
+
+
+# ---------------------------------------------------------------------------
+# Single-precision variants (opt-in).  The smooth disks are order-unity
+# smooth functions, so float32 (~1e-7 relative) is ample for scans and maps;
+# accumulate DM from these in float64.  Not used by the default model path,
+# whose regression tests are pinned at float64 precision.
+
+# Optional sech2 lookup table for the float32 kernels: sech2(u) sampled on
+# [0, _SECH2_TAB_UMAX] with linear interpolation (rel. error < 5e-6; zero
+# beyond the table, where sech2 < 2e-10).  Independent of the model, since
+# the scale height is applied before the lookup.  Filled through sech2.py_func
+# so that importing does not load the compiled array version.
+_SECH2_TAB_N = 4096
+_SECH2_TAB_UMAX = 12.
+_SECH2_TAB_SCALE = _SECH2_TAB_N/_SECH2_TAB_UMAX
+_u_tab = np.linspace(0., _SECH2_TAB_UMAX, _SECH2_TAB_N+1)
+_SECH2_TAB = np.append(sech2.py_func(_u_tab), 0.).astype(np.float32)
+del _u_tab
+
+@njit(inline='always', fastmath=True, boundscheck=False, error_model='numpy')
+def _sech2_32(u, use_lut, tab, scale):  # pragma: no cover
+    """float32 sech2(u), u >= 0, from config_nemod.sech2 or by table lookup"""
+    if use_lut:
+        s = u*scale
+        if s >= np.float32(_SECH2_TAB_N):
+            return np.float32(0.)
+        k = int(s)
+        f = s - np.float32(k)
+        return tab[k] + f*(tab[k+1] - tab[k])
+    return np.float32(sech2(u))
+
+@njit(parallel=True, cache=True, fastmath=True, boundscheck=False,
+      error_model='numpy')
+def _ne_outer32_jit(x, y, z, A1, h1, amp, use_lut, tab, scale):  # pragma: no cover
+    """float32 ne_outer over arrays of LoS samples"""
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float32)
+    ph = np.float32(pihalf)
+    one = np.float32(1.)
+    inv_A1 = one/A1
+    inv_h1 = one/h1
+    for i in prange(n):
+        rr = np.sqrt(x[i]*x[i] + y[i]*y[i])
+        sech2_val = _sech2_32(np.abs(z[i])*inv_h1, use_lut, tab, scale)
+        g1 = np.cos(ph*rr*inv_A1) if rr <= A1 else np.float32(0.)
+        out[i] = amp*g1*sech2_val
+    return out
+
+@njit(parallel=True, cache=True, fastmath=True, boundscheck=False,
+      error_model='numpy')
+def _ne_inner32_jit(x, y, z, A2, n2, h2, use_lut, tab, scale):  # pragma: no cover
+    """float32 ne_inner over arrays of LoS samples"""
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float32)
+    one = np.float32(1.)
+    inv_w2 = np.float32(_INV_WIDTH2)
+    inv_h2 = one/h2
+    for i in prange(n):
+        rr = np.sqrt(x[i]*x[i] + y[i]*y[i])
+        drr = rr - A2
+        rrarg = drr*drr*inv_w2
+        sech2_val = _sech2_32(np.abs(z[i])*inv_h2, use_lut, tab, scale)
+        g2 = np.exp(-rrarg) if rrarg < np.float32(10.) else np.float32(0.)
+        out[i] = n2*g2*sech2_val
+    return out
+
+def _as_f4(a):
+    return np.ascontiguousarray(a, dtype=np.float32)
+
+def ne_outer32(x, y, z, lut=False):
+    """
+    float32 version of ne_outer_vec; returns float32 (ne1, F1) arrays.
+    lut=True evaluates sech2 from a lookup table (ignored without numba).
+    """
+    if HAS_NUMBA:
+        ne1 = _ne_outer32_jit(_as_f4(x), _as_f4(y), _as_f4(z), np.float32(A1),
+                              np.float32(h1),
+                              np.float32(_N1H1_OVER_H1*_SUNCOS_INV),
+                              lut, _SECH2_TAB, np.float32(_SECH2_TAB_SCALE))
+    else:
+        ne1 = ne_outer_vec(x, y, z)[0].astype(np.float32)
+    return ne1, np.full_like(ne1, F1)
+
+def ne_inner32(x, y, z, lut=False):
+    """
+    float32 version of ne_inner_vec; returns float32 (ne2, F2) arrays.
+    lut=True evaluates sech2 from a lookup table (ignored without numba).
+    """
+    if HAS_NUMBA:
+        ne2 = _ne_inner32_jit(_as_f4(x), _as_f4(y), _as_f4(z), np.float32(A2),
+                              np.float32(n2), np.float32(h2),
+                              lut, _SECH2_TAB, np.float32(_SECH2_TAB_SCALE))
+    else:
+        ne2 = ne_inner_vec(x, y, z)[0].astype(np.float32)
+    return ne2, np.full_like(ne2, F2)
@@ -44,6 +44,7 @@ from scipy.integrate import cumulative_trapezoid
 from mwprop.nemod.config_nemod import *
 from mwprop.nemod.density import *
 from mwprop.nemod.neclumpN_fast import *
+from mwprop.nemod.numba_compat import njit, HAS_NUMBA
 
 import datetime as datetime
 import time
@@ -74,6 +75,10 @@ def calc_galcentric_vecs(l, b, dmax, Ns):
     Output:
         svec = vector of steps along the LoS up to dmax
         xvec, yvec, zvec = vectors of x,y,z coordinates
+
+    xvec, yvec, zvec are the rows of one contiguous (3, Ns) array, which
+    the array density kernels take without copying (see
+    config_nemod.stack_coords).
     """
     sl=sin(l)
     cl=cos(l)
@@ -82,11 +87,38 @@ def calc_galcentric_vecs(l, b, dmax, Ns):
 
     svec = linspace(0, dmax, Ns)
     rvec = svec * cb
-    xvec = rvec * sl
-    yvec = rsun - rvec * cl
-    zvec = svec * sb
+    coords = np.empty((3, Ns))
+    coords[0] = rvec * sl
+    coords[1] = rsun - rvec * cl
+    coords[2] = svec * sb
+    xvec, yvec, zvec = coords
     return svec, xvec, yvec, zvec
 
+@njit(cache=True, boundscheck=False)
+def _dm_cumulate_jit(ne, dx, scale):  # pragma: no cover
+    """
+    scale * cumulative_trapezoid(ne, dx=dx, initial=0) in a single pass.
+
+    Same operation order as scipy (running sum of dx*(ne[i]+ne[i-1])/2),
+    so results are bit-identical; no fastmath for that reason.
+    """
+    n = ne.shape[0]
+    out = np.empty(n)
+    out[0] = 0.
+    acc = 0.
+    for i in range(1, n):
+        acc += dx*(ne[i] + ne[i-1])/2.0
+        out[i] = scale*acc
+    return out
+
+def dm_cumulate(ne, dx):
+    """
+    Cumulative DM (pc cm^-3) along a uniformly sampled LoS with step dx (kpc).
+    """
+    if HAS_NUMBA:
+        return _dm_cumulate_jit(ne, dx, pc_in_kpc)
+    return pc_in_kpc * cumulative_trapezoid(ne, dx=dx, initial=0.0)
+
 # ----------------------------------------------------------------------
 # SKO -- 3/2/22 changed ds_coarse to 0.1 for both functions (was previously 0.2 for dm2d), changed ds_fine to 0.005
 # changed Nsmin to 20 from 10
@@ -225,7 +257,7 @@ def dmdsm_dm2d(l, b, dm_target, ds_coarse=0.1, ds_fine=0.01, Nsmin=20,
         #if np.count_nonzero(wgcN*necN)!=0:
         	#print('Warning: Clump(s) intersected. Run los_diagnostics.py for details.')
 
-        dm_cumulate_vec = pc_in_kpc * cumulative_trapezoid(ne, dx=ds_fine_step, initial=0.0)
+        dm_cumulate_vec = dm_cumulate(ne, ds_fine_step)
         dm_calc_max = dm_cumulate_vec[-1]       # maximum dm calculated for this pass
 
         # Interpolate to get distance estimate:
@@ -488,7 +520,7 @@ def dmdsm_d2dm(l, b, d_target, ds_coarse, ds_fine, Nsmin,
     ne_ex_clumps_voids = (1.-wglism*wlism) * (ne_smooth + wggc*negc) + wglism*wlism*nelism
     ne = (1-wgvN*wvoid)*ne_ex_clumps_voids  + wgvN*wvoid*nevN + wgcN*necN
 
-    dm_cumulate_vec = pc_in_kpc * cumulative_trapezoid(ne, dx=ds_fine_step, initial=0.0)
+    dm_cumulate_vec = dm_cumulate(ne, ds_fine_step)
     dm_calc_max = dm_cumulate_vec[-1]
 
     # floats -> ints:
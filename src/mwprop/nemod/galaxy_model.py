@@ -27,6 +27,72 @@ A module-level singleton ``default_model`` is created on first import.
 import numpy as np
 from scipy.interpolate import CubicSpline
 
+from mwprop.nemod.numba_compat import njit
+
+
+@njit(cache=True)
+def eval_arm_radius(j, theta, coefs, th_grid):  # pragma: no cover
+    """
+    Radius (kpc) of arm j at angle theta (rad).
+
+    coefs   : (narms, nseg, 4) piecewise-polynomial coefficients per arm
+              and segment, highest power first (``CubicSpline.c`` transposed)
+    th_grid : (narms, nseg+1) breakpoints of each arm's spline
+
+    Outside the breakpoints the end polynomials are extrapolated, matching
+    ``CubicSpline`` with its default ``extrapolate=True``.
+    """
+    nseg = coefs.shape[1]
+    k = np.searchsorted(th_grid[j], theta, 'right') - 1
+    if k < 0:
+        k = 0
+    elif k > nseg - 1:
+        k = nseg - 1
+    dx = theta - th_grid[j, k]
+    c = coefs[j, k]
+    return ((c[0]*dx + c[1])*dx + c[2])*dx + c[3]
+
+
+@njit(cache=True)
+def eval_all_arms(theta, coefs, th_grid, out):  # pragma: no cover
+    """
+    Evaluate every arm-radius cubic at its own angle in one call.
+
+    theta : (narms,) angle at which to evaluate each arm (rad)
+    out   : (narms,) filled with the arm radii (kpc)
+
+    coefs and th_grid as for ``eval_arm_radius``.
+    """
+    for j in range(theta.shape[0]):
+        out[j] = eval_arm_radius(j, theta[j], coefs, th_grid)
+
+
+def _uniform_segments(theta, grid, dth):
+    """
+    Segment index of each theta on uniformly spaced knots ``grid`` (along
+    the last axis), equal to ``searchsorted(grid, theta, 'right') - 1``
+    clipped to the end segments as ``CubicSpline`` does.  The index comes
+    from the spacing ``dth`` and is moved by one where rounding puts it on
+    the wrong side of a knot.
+    """
+    nseg = grid.shape[-1] - 1
+    seg = np.floor((theta - grid[..., :1]) / dth)
+    seg = np.clip(seg, 0, nseg - 1).astype(np.intp)
+    seg -= (theta < np.take_along_axis(grid, seg, axis=-1)) & (seg > 0)
+    seg += ((theta >= np.take_along_axis(grid, seg + 1, axis=-1))
+            & (seg < nseg - 1))
+    return seg
+
+
+def _ppoly_cubic(c0, c1, c2, c3, u):
+    """c0*u**3 + c1*u**2 + c2*u + c3, summed in the order PPoly uses"""
+    z = u * u
+    r = c3 + c2 * u
+    r += c1 * z
+    z *= u
+    r += c0 * z
+    return r
+
 
 class GalaxyModel:
     """
@@ -44,9 +110,20 @@ class GalaxyModel:
     arm_radius_splines : list[CubicSpline]
         ``CubicSpline(theta, radius)`` for each arm — built once, reused
         across all LoS evaluations instead of being recreated per call.
-    arm_index : np.ndarray, shape (narms,), int
+    arm_radius_coefs : np.ndarray, shape (narms, Ncoarse-1, 4)
+        Coefficients of ``arm_radius_splines``, one contiguous
+        (segment, power) table per arm, highest power first.
+    arm_radius_th_grid : np.ndarray, shape (narms, Ncoarse)
+        Breakpoints (angles, rad) of ``arm_radius_splines``.
+    arm_radius_dth : np.ndarray, shape (narms,)
+        Knot spacing of each arm's spline; the coarse arm angles are
+        uniformly spaced (``np.linspace`` in config_nemod).
+    arm_index : np.ndarray, shape (narms,), int64
         Maps sequential arm index *j* to the TC93 / NE2001 arm numbering.
-    warm, harm, narm : np.ndarray, shape (narms,)
+    arm_tc_map : np.ndarray, shape (narms+1,), int64
+        ``arm_tc_map[j+1] = arm_index[j]`` and ``arm_tc_map[0] = 0``: the
+        TC93 arm number for a 1-based nearest-arm index (0 = no arm).
+    warm, harm, narm : np.ndarray, shape (narms,), float64
         Per-arm width, height and amplitude scale factors from *Dgal*.
     wa, Aa, ha, Fa, na : float
         Scalar arm parameters from *Dgal*.
@@ -87,22 +164,38 @@ class GalaxyModel:
                 CubicSpline(th1[j, :], r1[j, :]) for j in range(narms)
             ]
 
+        # ----------------------------------------------------------------
+        # Packed spline coefficients for evaluating all arms in one call
+        # instead of one CubicSpline.__call__ per arm.
+        # ----------------------------------------------------------------
+        self.arm_radius_coefs = np.ascontiguousarray(
+            np.stack([spl.c.T for spl in self.arm_radius_splines]))
+        self.arm_radius_th_grid = np.ascontiguousarray(
+            np.stack([spl.x for spl in self.arm_radius_splines]))
+        self.arm_radius_dth = ((self.arm_radius_th_grid[:, -1]
+                                - self.arm_radius_th_grid[:, 0])
+                               / (self.arm_radius_th_grid.shape[1] - 1))
+
         # ----------------------------------------------------------------
         # Integer arm-index mapping
         # Previously: np.fromiter(...) executed on every ne_arms call.
         # ----------------------------------------------------------------
-        self.arm_index = np.fromiter(
-            (Darmmap[str(j)] for j in range(narms)), dtype=int
-        )
+        self.arm_index = np.array([Darmmap[j] for j in range(narms)],
+                                  dtype=np.int64)
+        # Same, indexed by the 1-based nearest-arm number with 0 ==> no arm
+        self.arm_tc_map = np.concatenate(([0], self.arm_index))
 
         # ----------------------------------------------------------------
         # Per-arm scale-parameter arrays
         # Previously: three list-comprehension+dict-lookup passes executed
         # inside the per-arm loop on every ne_arms call.
         # ----------------------------------------------------------------
-        self.warm = np.array([Dgal['warm' + str(jj)] for jj in self.arm_index])
-        self.harm = np.array([Dgal['harm' + str(jj)] for jj in self.arm_index])
-        self.narm = np.array([Dgal['narm' + str(jj)] for jj in self.arm_index])
+        self.warm = np.ascontiguousarray(
+            [Dgal['warm' + str(jj)] for jj in self.arm_index], dtype=np.float64)
+        self.harm = np.ascontiguousarray(
+            [Dgal['harm' + str(jj)] for jj in self.arm_index], dtype=np.float64)
+        self.narm = np.ascontiguousarray(
+            [Dgal['narm' + str(jj)] for jj in self.arm_index], dtype=np.float64)
 
         # ----------------------------------------------------------------
         # Scalar arm parameters
@@ -118,6 +211,37 @@ class GalaxyModel:
     # Public API
     # ------------------------------------------------------------------
 
+    def eval_arm_radii(self, theta):
+        """Radius of every arm, arm *j* evaluated at ``theta[j]``.
+
+        Equivalent to ``[self.arm_radius_splines[j](theta[j]) for j ...]``
+        but done in a single compiled call.
+
+        Returns np.ndarray, shape (narms,).
+        """
+        out = np.empty(self.narms)
+        eval_all_arms(np.asarray(theta, dtype=np.float64),
+                      self.arm_radius_coefs, self.arm_radius_th_grid, out)
+        return out
+
+    def eval_arm_radii_vec(self, theta):
+        """Radius of every arm at many angles, arm *j* at ``theta[j, :]``.
+
+        Same values as ``self.arm_radius_splines[j](theta[j])`` for each j,
+        for all arms in one set of array operations.  The segment index
+        comes from the uniform knot spacing (``_uniform_segments``) and the
+        cubic is summed in the order ``CubicSpline`` uses.
+
+        theta : array, shape (narms, N).  Returns np.ndarray, shape (narms, N).
+        """
+        grid = self.arm_radius_th_grid
+        theta = np.asarray(theta, dtype=np.float64)
+        seg = _uniform_segments(theta, grid, self.arm_radius_dth[:, None])
+        u = theta - np.take_along_axis(grid, seg, axis=1)
+        c = np.take_along_axis(self.arm_radius_coefs, seg[:, :, None], axis=1)
+        r = _ppoly_cubic(c[..., 0], c[..., 1], c[..., 2], c[..., 3], u)
+        return r
+
     def refresh(self):
         """Re-run setup; call after ``set_model()`` switches the galaxy model.
 
@@ -15,19 +15,418 @@ Version history:
      * Modified to use GalaxyModel class with pre-instantiated attributes
 """
 
+import math
+import warnings
+
 from mwprop.nemod.config_nemod import *
-from mwprop.nemod.galaxy_model import default_model
+from mwprop.nemod.galaxy_model import default_model, eval_arm_radius
+from mwprop.nemod.numba_compat import njit, HAS_NUMBA
 
 script_path = os.path.dirname(os.path.realpath(__file__))
 
-def ne_arms_ne2001p(x, y, z, Ncoarse=20, dthfine=0.01, nfinespline=5,
+
+# ---------------------------------------------------------------------------
+# Replacement for the per-position CubicSpline refinement.
+# It reproduces CubicSpline (not-a-knot end conditions) on each small
+# stencil of coarse samples and the argmin over np.arange(th0, thn, dthfine)
+# with the same operation order as scipy / numpy, so the nearest-arm angles
+# agree with the spline path to rounding.  No fastmath, for that reason.
+#
+# The tridiagonal matrix for the knot slopes depends only on the stencil
+# angles, not on the squared distances, so its Thomas factorization
+# (modified upper diagonal cp and pivots den) is computed once per stencil
+# and shared by all positions using it; each position then only does the
+# right-hand-side sweep and back substitution.
+
+@njit(cache=True, boundscheck=False)
+def _nak_factor_jit(x, cp, den):  # pragma: no cover
+    """Thomas factors of the not-a-knot slope system on knots x (len >= 4)"""
+    n = x.shape[0]
+    den[0] = x[2] - x[1]
+    cp[0] = (x[2] - x[0])/den[0]
+    for i in range(1, n-1):
+        dxl = x[i] - x[i-1]
+        dxr = x[i+1] - x[i]
+        den[i] = 2*(dxl + dxr) - dxr*cp[i-1]
+        cp[i] = dxl/den[i]
+    den[n-1] = (x[n-2] - x[n-3]) - (x[n-1] - x[n-3])*cp[n-2]
+
+@njit(cache=True, boundscheck=False)
+def _nak_slopes_jit(x, y, cp, den, s, dp):  # pragma: no cover
+    """Knot slopes s of the not-a-knot spline through (x, y), as CubicSpline"""
+    n = x.shape[0]
+    if n == 2:
+        m0 = (y[1] - y[0])/(x[1] - x[0])
+        s[0] = m0
+        s[1] = m0
+    elif n == 3:
+        # both ends not-a-knot: the parabola through the three points
+        dx0 = x[1] - x[0]
+        dx1 = x[2] - x[1]
+        m0 = (y[1] - y[0])/dx0
+        m1 = (y[2] - y[1])/dx1
+        s[1] = (dx0*m1 + dx1*m0)/(dx0 + dx1)
+        s[0] = 2*m0 - s[1]
+        s[2] = 2*m1 - s[1]
+    else:
+        dx0 = x[1] - x[0]
+        dx1 = x[2] - x[1]
+        m0 = (y[1] - y[0])/dx0
+        m1 = (y[2] - y[1])/dx1
+        d = x[2] - x[0]
+        dp[0] = ((dx0 + 2*d)*dx1*m0 + dx0**2*m1)/d/den[0]
+        for i in range(1, n-1):
+            dxl = x[i] - x[i-1]
+            dxr = x[i+1] - x[i]
+            ml = (y[i] - y[i-1])/dxl
+            mr = (y[i+1] - y[i])/dxr
+            dp[i] = (3*(dxr*ml + dxl*mr) - dxr*dp[i-1])/den[i]
+        dxl = x[n-2] - x[n-3]
+        dxr = x[n-1] - x[n-2]
+        ml = (y[n-2] - y[n-3])/dxl
+        mr = (y[n-1] - y[n-2])/dxr
+        d = x[n-1] - x[n-3]
+        dp[n-1] = ((dxr**2*ml + (2*d + dxr)*dxl*mr)/d - d*dp[n-2])/den[n-1]
+        s[n-1] = dp[n-1]
+        for i in range(n-2, -1, -1):
+            s[i] = dp[i] - cp[i]*s[i+1]
+
+@njit(cache=True, boundscheck=False)
+def _spline_argmin_jit(x, y, dthfine, s):  # pragma: no cover
+    """
+    Angle on the grid np.arange(x[0], x[-1], dthfine) that minimises the
+    cubic through (x, y) with knot slopes s.
+    """
+    n = x.shape[0]
+
+    # Fine grid as np.arange builds it: start + q*((start+step) - start)
+    start = x[0]
+    nfine = int(np.ceil((x[n-1] - start)/dthfine))
+    delta = (start + dthfine) - start
+
+    best = np.inf
+    thbest = start
+    seg = -1
+    xl = 0.
+    xr = x[0]
+    c0 = c1 = c2 = c3 = 0.
+    for q in range(nfine):
+        if q == 1:
+            t = start + dthfine
+        else:
+            t = start + q*delta
+        if t >= xr and seg < n-2:
+            while seg < n-2 and t >= x[seg+1]:
+                seg += 1
+            xl = x[seg]
+            xr = x[seg+1]
+            # Hermite coefficients of this segment, as CubicHermiteSpline
+            h = xr - xl
+            slope = (y[seg+1] - y[seg])/h
+            tt = (s[seg] + s[seg+1] - 2*slope)/h
+            c0 = tt/h
+            c1 = (slope - s[seg])/h - tt
+            c2 = s[seg]
+            c3 = y[seg]
+        # PPoly evaluation order: sum of c_k * u**k, powers built up
+        u = t - xl
+        z = u
+        val = c3 + c2*z
+        z = z*u
+        val = val + c1*z
+        z = z*u
+        val = val + c0*z
+        if val < best:
+            best = val
+            thbest = t
+    return thbest
+
+@njit(cache=True, boundscheck=False)
+def _arm_refine_jit(th1, coarse_arms, xvec, yvec, index_dsqmin, nspline2,  # pragma: no cover
+                    dthfine):
+    """
+    Nearest-arm angle for every arm and position.
+
+    th1          : (narms, Ncoarse) coarse arm angles
+    coarse_arms  : (2, narms, Ncoarse) coarse arm positions
+    xvec, yvec   : (N,) positions
+    index_dsqmin : (narms, N) coarse argmin
+    Returns thjmin, shape (narms, N).  The squared distances on each stencil
+    are computed here in float64.
+    """
+    narms, N = index_dsqmin.shape
+    Ncoarse = th1.shape[1]
+    thjmin = np.empty((narms, N))
+    nmax = 2*nspline2 + 2
+    ys = np.empty(nmax)
+    s = np.empty(nmax)
+    dp = np.empty(nmax)
+    # Thomas factors for the stencil around each coarse index of one arm
+    cp_k = np.empty((Ncoarse, nmax))
+    den_k = np.empty((Ncoarse, nmax))
+    for j in range(narms):
+        for k in range(Ncoarse):
+            lo = max(0, k - nspline2 - 1)
+            hi = min(k + nspline2 + 1, Ncoarse)
+            if hi - lo >= 4:
+                _nak_factor_jit(th1[j, lo:hi], cp_k[k], den_k[k])
+        for i in range(N):
+            k = index_dsqmin[j, i]
+            lo = max(0, k - nspline2 - 1)
+            hi = min(k + nspline2 + 1, Ncoarse)
+            n = hi - lo
+            if n < 2:
+                thjmin[j, i] = th1[j, lo]
+                continue
+            for m in range(lo, hi):
+                ys[m-lo] = ((coarse_arms[0, j, m] - xvec[i])**2
+                            + (coarse_arms[1, j, m] - yvec[i])**2)
+            _nak_slopes_jit(th1[j, lo:hi], ys[:n], cp_k[k], den_k[k], s, dp)
+            thjmin[j, i] = _spline_argmin_jit(th1[j, lo:hi], ys[:n], dthfine, s)
+    return thjmin
+
+
+@njit(cache=True, boundscheck=False)
+def _ne_arms_core(x, y, z, coarse_arms, th1, arm_radius_coefs,
+                  arm_radius_th_grid, arm_index, warm, harm, narm, wa, Aa, ha,
+                  na, nspline2, dthfine):  # pragma: no cover
+    """
+    Compiled body of ne_arms_ne2001p for one position.
+
+    Same steps as the Python loop: coarse argmin, spline refinement of the
+    nearest angle, arm radius there and the density factor of each arm in
+    range.  Returns (nea, whicharm_spiralmodel); the arm-number and F
+    lookups are left to the caller.
+    """
+    narms, Ncoarse = th1.shape
+    nmax = 2*nspline2 + 2
+    ys = np.empty(nmax)
+    s = np.empty(nmax)
+    dp = np.empty(nmax)
+    cp = np.empty(nmax)
+    den = np.empty(nmax)
+
+    rr = np.sqrt(x**2 + y**2)
+    thxydeg = np.arctan2(-x, y)*(180./np.pi)
+    if thxydeg < 0:
+        thxydeg += 360
+
+    nea = 0.
+    whicharm_spiralmodel = 0
+    dmin_min = 0.
+    for j in range(narms):
+        # coarse argmin (first minimum, as np.argmin)
+        k = 0
+        dsqmin = np.inf
+        for m in range(Ncoarse):
+            dsq = (coarse_arms[0, j, m] - x)**2 + (coarse_arms[1, j, m] - y)**2
+            if dsq < dsqmin:
+                dsqmin = dsq
+                k = m
+
+        # fine refinement on the spline through the stencil around k
+        lo = max(0, k - nspline2 - 1)
+        hi = min(k + nspline2 + 1, Ncoarse)
+        n = hi - lo
+        if n < 2:
+            thjmin = th1[j, lo]
+        else:
+            for m in range(lo, hi):
+                ys[m-lo] = ((coarse_arms[0, j, m] - x)**2
+                            + (coarse_arms[1, j, m] - y)**2)
+            if n >= 4:
+                _nak_factor_jit(th1[j, lo:hi], cp, den)
+            _nak_slopes_jit(th1[j, lo:hi], ys[:n], cp, den, s, dp)
+            thjmin = _spline_argmin_jit(th1[j, lo:hi], ys[:n], dthfine, s)
+
+        rjmin = eval_arm_radius(j, thjmin, arm_radius_coefs,
+                                arm_radius_th_grid)
+        xjmin = -rjmin*np.sin(thjmin)
+        yjmin = rjmin*np.cos(thjmin)
+        dmin = np.sqrt((x - xjmin)**2 + (y - yjmin)**2)
+
+        if j == 0:
+            dmin_min = dmin
+        if dmin < 3.*wa:
+            if dmin <= dmin_min:
+                dmin_min = dmin
+                whicharm_spiralmodel = j + 1
+
+            argxy = dmin/(wa*warm[j])
+            ga = np.exp(-argxy**2)
+            if rr > Aa:
+                ga *= sech2((rr - Aa)/2.)
+            ga *= sech2(z/(ha*harm[j]))
+
+            jj = arm_index[j]
+            if jj == 3:             # TC arm 3
+                test3 = thxydeg - 290
+                if test3 < 0:
+                    test3 += 360
+                if 0 <= test3 and test3 < 73:
+                    arg = 2.*np.pi*test3/73
+                    ga *= ((1 + np.cos(arg))/2)**4
+            if jj == 2:             # TC arm 2
+                test2 = thxydeg - 340
+                if test2 < 0:
+                    test2 += 360
+                if 0 <= test2 and test2 < 30:
+                    arg = 2.*np.pi*test2/30
+                    ga *= ((1 + 0.1 + (1 - 0.1)*np.cos(arg))/2)**3.5
+
+            nea += ga*narm[j]*na
+    return nea, whicharm_spiralmodel
+
+
+# NumPy version: stencil data (Thomas factors, fine grid, segment offsets)
+# keyed by the stencil angles and fine step, so it survives across calls and
+# is rebuilt automatically if the arms change (set_model reloads this module).
+# There are at most narms*Ncoarse stencils per fine step, so each fine grid
+# is built once with np.arange and then reused, never reallocated per call.
+_stencil_cache = {}
+
+def _stencil_data(th_k, dthfine):
+    key = (th_k.tobytes(), dthfine)
+    data = _stencil_cache.get(key)
+    if data is None:
+        n = th_k.size
+        cp = np.empty(n)
+        den = np.empty(n)
+        if n >= 4:
+            _nak_factor_jit(th_k, cp, den)
+        thjfine = np.arange(th_k[0], th_k[-1], dthfine)
+        seg = np.clip(np.searchsorted(th_k, thjfine, 'right') - 1, 0, n - 2)
+        u = thjfine - th_k[seg]
+        # Block Vandermonde matrix: row q holds [1, u, u**2, u**3] of fine
+        # point q in the columns of its segment, zeros elsewhere, so that
+        # R @ C evaluates every segment's cubic in one matrix product.
+        R = np.zeros((thjfine.size, n - 1, 4))
+        R[np.arange(thjfine.size), seg] = np.column_stack((np.ones_like(u), u,
+                                                          u*u, u*u*u))
+        data = (np.diff(th_k), cp, den, thjfine, R.reshape(thjfine.size, -1))
+        _stencil_cache[key] = data
+    return data
+
+def _nak_slopes(th_k, dx, cp, den, Y):
+    """_nak_slopes_jit over the columns of Y (n, m), NumPy version"""
+    n = th_k.size
+    m = np.diff(Y, axis=0) / dx[:, None]
+    s = np.empty_like(Y)
+    if n == 2:
+        s[0] = m[0]
+        s[1] = m[0]
+    elif n == 3:
+        s[1] = (dx[0]*m[1] + dx[1]*m[0])/(dx[0] + dx[1])
+        s[0] = 2*m[0] - s[1]
+        s[2] = 2*m[1] - s[1]
+    else:
+        dp = np.empty_like(Y)
+        d = th_k[2] - th_k[0]
+        dp[0] = ((dx[0] + 2*d)*dx[1]*m[0] + dx[0]**2*m[1])/d/den[0]
+        for i in range(1, n-1):
+            dp[i] = (3*(dx[i]*m[i-1] + dx[i-1]*m[i]) - dx[i]*dp[i-1])/den[i]
+        d = th_k[n-1] - th_k[n-3]
+        dp[n-1] = ((dx[n-2]**2*m[n-3] + (2*d + dx[n-2])*dx[n-3]*m[n-2])/d
+                   - d*dp[n-2])/den[n-1]
+        s[n-1] = dp[n-1]
+        for i in range(n-2, -1, -1):
+            s[i] = dp[i] - cp[i]*s[i+1]
+    return s, m
+
+def _arm_refine_splines(th1, coarse_arms, xvec, yvec, index_dsqmin, nspline2,
+                        dthfine):
+    """
+    NumPy version of _arm_refine_jit: positions sharing a coarse index
+    share a stencil, so the slope solve and fine-grid evaluation are done
+    for all of them at once, one (arm, index) group at a time.
+    """
+    narms, N = index_dsqmin.shape
+    Ncoarse = th1.shape[1]
+    thjmin = np.empty((narms, N))
+    for j in range(narms):
+        # Bucket positions by coarse index with one stable sort: positions
+        # with index k are order[bounds[b]:bounds[b+1]], in increasing order.
+        order    = np.argsort(index_dsqmin[j], kind='stable')
+        sorted_k = index_dsqmin[j][order]
+        bounds   = np.concatenate(([0], np.flatnonzero(np.diff(sorted_k)) + 1,
+                                   [N]))
+        for b in range(bounds.size - 1):
+            pos_k = order[bounds[b]:bounds[b+1]]          # indices into xvec
+            k     = sorted_k[bounds[b]]
+            lo    = max(0, k - nspline2 - 1)
+            hi    = min(k + nspline2 + 1, Ncoarse)
+            th_k  = th1[j, lo:hi]                         # (len_ind1,)
+
+            # dsq_k shape: (len_ind1, n_k)
+            dsq_k = ((coarse_arms[0, j, lo:hi, np.newaxis] - xvec[pos_k])**2
+                     + (coarse_arms[1, j, lo:hi, np.newaxis] - yvec[pos_k])**2)
+            dx, cp, den, thjfine, R = _stencil_data(th_k, dthfine)
+            s, slope = _nak_slopes(th_k, dx, cp, den, dsq_k)
+
+            # Hermite coefficients per segment, as CubicHermiteSpline,
+            # stacked as C (4*nseg, n_k) in the column order of R
+            h = dx[:, None]
+            tt = (s[:-1] + s[1:] - 2*slope)/h
+            C = np.stack((dsq_k[:-1], s[:-1], (slope - s[:-1])/h - tt, tt/h),
+                         axis=1).reshape(R.shape[1], -1)
+            fine_vals = R @ C                                   # (len_fine, n_k)
+            thjmin[j, pos_k] = thjfine[fine_vals.argmin(axis=0)]
+    return thjmin
+
+
+def _arm_lookup(nea, whicharm_spiralmodel, model):
+    """(nea, Farm, whicharm) for the nearest arm found by ne_arms_ne2001p"""
+    if whicharm_spiralmodel == 0:
+        whicharm = 0
+        Farm = 0
+    else:
+        whicharm = model.arm_tc_map[whicharm_spiralmodel]
+        #Farm = Dgal['Fa'] * Dgal['farm'+str(whicharm)]    # Intended value
+
+        ###### NOTE ######
+        # 2020 Feb 9:
+        # found that the Fortran code doesn't use Farm calculated using
+        # Fa x farm_j parameters.  This seems to be an error in dmdsm.NE2001.f,
+        # which uses Fa to calculate SM for the spiral arms instead of Faval,
+        # the value returned by density.NE2001.f.    This only affects the
+        # spiral arm values for SM.
+
+        # For now, maintain this error in the Python code because the aim here
+        # is to replicate the Fortran code:
+
+        Farm = model.Fa
+
+        # The question is then whether the error was in the code when fitting
+        # was done to find the best values of farm_j?   I think the error was
+        # not there during the fitting because some of the earlier code versions
+        # use Fa * farm_j.
+
+    return nea, Farm, whicharm
+
+
+def _n_coarse(Ncoarse):
+    """
+    Number of coarse samples along each arm, from coarse_arms itself
+    (read at call time: los_diagnostics swaps in its own coarse_arms).
+    The Ncoarse argument of the ne_arms functions is deprecated; a
+    value that disagrees with coarse_arms used to give wrong stencils.
+    """
+    if Ncoarse is not None:
+        warnings.warn('Ncoarse is deprecated and ignored; the number of '
+                      'coarse arm samples is taken from coarse_arms',
+                      DeprecationWarning, stacklevel=3)
+    return coarse_arms.shape[2]
+
+
+def ne_arms_ne2001p(x, y, z, Ncoarse=None, dthfine=0.01, nfinespline=5,
                     verbose=False, model=None):
     """
     Evaluates electron density and F parameter for arm nearest to x,y,z
 
     Input:
         x, y, z = location in NE2001  coordinates  in kpc
-        Ncoarse = number of coarse samples along each arm
+        Ncoarse = deprecated and ignored: number of coarse samples along
+                  each arm, now taken from coarse_arms
         dthfine = step size in Galactocentric angle for fine sampling (rad)
         nfinespline = number of coarse samples to use for fine-sampling spline
         verbose = True:  writes out n_e component information
@@ -40,6 +439,18 @@ def ne_arms_ne2001p(x, y, z, Ncoarse=20, dthfine=0.01, nfinespline=5,
     """
     if model is None:
         model = default_model
+    Ncoarse = _n_coarse(Ncoarse)
+
+    # number of coarse samples to use as input to fine spline
+    nspline2 = int((nfinespline-1)/2)
+
+    if HAS_NUMBA and not verbose:
+        nea, whicharm_spiralmodel = _ne_arms_core(
+            x, y, z, coarse_arms, th1, model.arm_radius_coefs,
+            model.arm_radius_th_grid, model.arm_index, model.warm, model.harm,
+            model.narm, model.wa, model.Aa, model.ha, model.na, nspline2,
+            dthfine)
+        return _arm_lookup(nea, whicharm_spiralmodel, model)
 
     # First find coarse location of points on arms nearest to input point
 
@@ -49,9 +460,6 @@ def ne_arms_ne2001p(x, y, z, Ncoarse=20, dthfine=0.01, nfinespline=5,
 
     # Zoom in to find precision location and evaluate density and F parameter
 
-    # number of coarse samples to use as input to fine spline
-    nspline2 = int((nfinespline-1)/2)
-
     # Initialize
     nea = 0.
     ga = 0.
@@ -75,18 +483,29 @@ def ne_arms_ne2001p(x, y, z, Ncoarse=20, dthfine=0.01, nfinespline=5,
     if verbose:
         print('arms rr, thxydeg: ', rr, thxydeg)
 
-    for j in range(narms):
-
-        # Use fine spline on coarse samples  to find nearest position on j-th arm
+    # Use fine spline on coarse samples to find nearest position on each arm
 
+    ind1_all = []
+    thjmin_all = np.empty(narms)
+    for j in range(narms):
         ind1 = range(max(0, index_dsqmin[j]-nspline2-1),
                      min(index_dsqmin[j]+nspline2+1, Ncoarse), 1)
         dsqs = CubicSpline(th1[j, ind1], dsq_coarse[j, ind1])
-        thjfine = np.arange(th1[j, ind1[0]], th1[j, ind1[-1]], dthfine)
+        # fine grid np.arange(th1[j, ind1[0]], th1[j, ind1[-1]], dthfine),
+        # shared with the vectorized version through the stencil cache
+        thjfine = _stencil_data(th1[j, ind1[0]:ind1[-1]+1], dthfine)[3]
         ind_min = dsqs(thjfine).argmin()
-        thjmin = thjfine[ind_min]
-        # Use pre-computed arm radius spline from model — no per-call CubicSpline
-        rjmin = model.arm_radius_splines[j](thjmin)
+        thjmin_all[j] = thjfine[ind_min]
+        ind1_all.append(ind1)
+
+    # Radii of all arms at their nearest positions in a single call
+    rjmin_all = model.eval_arm_radii(thjmin_all)
+
+    for j in range(narms):
+
+        ind1 = ind1_all[j]
+        thjmin = thjmin_all[j]
+        rjmin = rjmin_all[j]
         xjmin, yjmin = -rjmin*np.sin(thjmin), rjmin*np.cos(thjmin)
 
         # Evaluate electron density for nearest spiral arm if it is within
@@ -157,30 +576,7 @@ def ne_arms_ne2001p(x, y, z, Ncoarse=20, dthfine=0.01, nfinespline=5,
                 print(
                     '%5.2f  %5.2f  %d  %d  %d    %4.2f  %4.2f  %4.2f    %4.2f  %7.5f'
                      %(s, rr, j, jj, whicharm_spiralmodel, wa, Wa, dmin, ga, nea))
-    if whicharm_spiralmodel == 0:
-        whicharm = 0
-        Farm = 0
-    else:
-        whicharm = Darmmap[str(whicharm_spiralmodel-1)]
-        #Farm = Dgal['Fa'] * Dgal['farm'+str(whicharm)]    # Intended value
-
-        ###### NOTE ######
-        # 2020 Feb 9:
-        # found that the Fortran code doesn't use Farm calculated using
-        # Fa x farm_j parameters.  This seems to be an error in dmdsm.NE2001.f,
-        # which uses Fa to calculate SM for the spiral arms instead of Faval,
-        # the value returned by density.NE2001.f.    This only affects the
-        # spiral arm values for SM.
-
-        # For now, maintain this error in the Python code because the aim here
-        # is to replicate the Fortran code:
-
-        Farm = model.Fa
-
-        # The question is then whether the error was in the code when fitting
-        # was done to find the best values of farm_j?   I think the error was
-        # not there during the fitting because some of the earlier code versions
-        # use Fa * farm_j.
+    nea, Farm, whicharm = _arm_lookup(nea, whicharm_spiralmodel, model)
 
     if verbose:
         print('arms whicharm_spiralmodel  whicharm: ',
@@ -191,7 +587,82 @@ def ne_arms_ne2001p(x, y, z, Ncoarse=20, dthfine=0.01, nfinespline=5,
 
 # ---------------------------------------------------------------------------
 
-def ne_arms_ne2001p_vec(xvec, yvec, zvec, Ncoarse=20, dthfine=0.01,
+@njit(cache=True, boundscheck=False)
+def _xy_to_cyl(x, y):  # pragma: no cover
+    """
+    Cylindrical radius rr and angle thxydeg (deg, CCW from +y, in [0, 360))
+    of each position, in one pass.
+    """
+    n = x.shape[0]
+    rr = np.empty(n)
+    th = np.empty(n)
+    for i in range(n):
+        rr[i] = math.sqrt(x[i]*x[i] + y[i]*y[i])
+        a = math.atan2(-x[i], y[i])*(180./math.pi)
+        th[i] = a + 360. if a < 0 else a
+    return rr, th
+
+# float32 copy of the coarse arm positions for the coarse argmin in
+# ne_arms_ne2001p_vec, kept with the coarse_arms array it was made from
+_coarse_arms_f32_cache = [None, None]
+
+def _coarse_arms_f32():
+    """float32 copy of coarse_arms, remade if coarse_arms is replaced"""
+    if _coarse_arms_f32_cache[0] is not coarse_arms:
+        _coarse_arms_f32_cache[:] = [
+            coarse_arms, np.ascontiguousarray(coarse_arms, dtype=np.float32)]
+    return _coarse_arms_f32_cache[1]
+
+# Bound on the float32 error of a coarse-sample distance, in units of the
+# coordinate scale: rounding of the coordinates and of the subtract, square
+# and sum, for both distances being compared, with a margin to spare
+_F32_DIST_TOL = 16*np.finfo(np.float32).eps
+
+def _coarse_argmin(xvec, yvec):
+    """
+    Index of the nearest coarse sample of every arm for every position,
+    shape (narms, N); the same as np.argmin over the float64 squared
+    distances.
+
+    The argmin is taken over float32 squared distances (half the memory
+    traffic of float64; only their order matters).  Positions where
+    another sample of the arm is within the float32 error of the minimum,
+    such as near-ties between the two ends of an arm, have their argmin
+    redone in float64 over all the samples of that arm.
+    """
+    coarse_arms_f32 = _coarse_arms_f32()
+    narms, nsamp = coarse_arms.shape[1:]
+    N = len(xvec)
+    cols = np.arange(N)
+    xf, yf = xvec.astype(np.float32), yvec.astype(np.float32)
+
+    # Per-position tolerance on the distances
+    scale = np.abs(coarse_arms).max() + np.maximum(np.abs(xvec), np.abs(yvec))
+    dist_tol = (_F32_DIST_TOL*scale).astype(np.float32)
+
+    # dsq_j shape: (nsamp, N), one arm at a time
+    dsq_j  = np.empty((nsamp, N), dtype=np.float32)
+    dy_sq  = np.empty((nsamp, N), dtype=np.float32)
+    index_dsqmin = np.empty((narms, N), dtype=np.intp)
+    for j in range(narms):
+        np.subtract(coarse_arms_f32[0, j, :, np.newaxis], xf, out=dsq_j)
+        np.square(dsq_j, out=dsq_j)
+        np.subtract(coarse_arms_f32[1, j, :, np.newaxis], yf, out=dy_sq)
+        np.square(dy_sq, out=dy_sq)
+        dsq_j += dy_sq
+        index_j = index_dsqmin[j]
+        np.argmin(dsq_j, axis=0, out=index_j)
+
+        # Near-ties: more than one sample within tolerance of the minimum
+        thresh = (np.sqrt(dsq_j[index_j, cols]) + dist_tol)**2
+        tied = np.flatnonzero(np.count_nonzero(dsq_j <= thresh, axis=0) > 1)
+        if tied.size:
+            dsq_tied = ((coarse_arms[0, j, :, np.newaxis] - xvec[tied])**2
+                        + (coarse_arms[1, j, :, np.newaxis] - yvec[tied])**2)
+            index_j[tied] = np.argmin(dsq_tied, axis=0)
+    return index_dsqmin
+
+def ne_arms_ne2001p_vec(xvec, yvec, zvec, Ncoarse=None, dthfine=0.01,
                         nfinespline=5, model=None):
     """
     Vectorized version of ne_arms_ne2001p.
@@ -203,128 +674,113 @@ def ne_arms_ne2001p_vec(xvec, yvec, zvec, Ncoarse=20, dthfine=0.01,
 
     Algorithm
     ---------
-    The inner CubicSpline refinement step is the same as the scalar version
-    but batched: positions are grouped by their coarse ``index_dsqmin`` value
-    (at most Ncoarse unique groups per arm).  Within each group the same
-    angular nodes ``th_k`` are shared, so scipy's 2-D CubicSpline
+    The inner CubicSpline refinement step is the same as the scalar version.
+    With numba it runs in one compiled call (``_arm_refine_jit``), which
+    solves each small not-a-knot spline directly.  Without numba, positions
+    are grouped by their coarse ``index_dsqmin`` value (at most Ncoarse
+    unique groups per arm); within each group the same angular nodes
+    ``th_k`` are shared, so scipy's 2-D CubicSpline
     ``CubicSpline(th_k, dsq_matrix)`` evaluates all positions in the group
     simultaneously, reducing CubicSpline calls from N*narms to at most
     Ncoarse*narms (e.g. 100 instead of 2500 for N=500).
     """
     if model is None:
         model = default_model
+    Ncoarse = _n_coarse(Ncoarse)
 
     N = len(xvec)
     narms = model.narms
     nspline2 = int((nfinespline - 1) / 2)
 
-    # dsq_coarse shape: (narms, Ncoarse, N)
-    dsq_coarse = (
-        (coarse_arms[0, :, :, np.newaxis] - xvec[np.newaxis, np.newaxis, :])**2 +
-        (coarse_arms[1, :, :, np.newaxis] - yvec[np.newaxis, np.newaxis, :])**2
-    )
-    # index_dsqmin shape: (narms, N)  — argmin over the Ncoarse axis
-    index_dsqmin = np.argmin(dsq_coarse, axis=1)
+    # index_dsqmin shape: (narms, N)  — coarse argmin over the arm samples
+    index_dsqmin = _coarse_argmin(xvec, yvec)
 
-    rr      = np.sqrt(xvec**2 + yvec**2)              # (N,)
-    thxydeg = np.rad2deg(np.arctan2(-xvec, yvec))     # (N,)
-    thxydeg = np.where(thxydeg < 0, thxydeg + 360., thxydeg)
+    if HAS_NUMBA:
+        rr, thxydeg = _xy_to_cyl(xvec, yvec)
+    else:
+        rr      = np.sqrt(xvec**2 + yvec**2)              # (N,)
+        thxydeg = np.rad2deg(np.arctan2(-xvec, yvec))     # (N,)
+        thxydeg[thxydeg < 0] += 360.
 
     arm_index = model.arm_index
     warm      = model.warm
     harm      = model.harm
     narm      = model.narm
 
+    # Nearest-point angle on every arm for every position: (narms, N)
+    refine = _arm_refine_jit if HAS_NUMBA else _arm_refine_splines
+    thjmin = refine(th1, coarse_arms, xvec, yvec, index_dsqmin, nspline2,
+                    dthfine)
+
+    # Angular amplitude re-scalings of TC arms 3 and 2 depend only on the
+    # position, so they are computed once here (1 outside the arm windows).
+    th3adeg, th3bdeg = 290, 363
+    test3    = (thxydeg - th3adeg) % 360.
+    fac_arm3 = np.where(test3 < th3bdeg - th3adeg,
+                        ((1 + np.cos(2. * np.pi * test3 / (th3bdeg - th3adeg)))
+                         / 2)**4, 1.)
+
+    th2adeg, th2bdeg = 340, 370
+    fac2min  = 0.1
+    test2    = (thxydeg - th2adeg) % 360.
+    fac_arm2 = np.where(test2 < th2bdeg - th2adeg,
+                        ((1 + fac2min + (1 - fac2min)
+                          * np.cos(2. * np.pi * test2 / (th2bdeg - th2adeg)))
+                         / 2)**3.5, 1.)
+
+    # Galactocentric radial factor of the arm density (1 inside Aa); the
+    # same for every arm
+    fac_rr = np.where(rr > model.Aa, sech2((rr - model.Aa) / 2.), 1.)
+
     nea_v               = np.zeros(N)
-    whicharm_spiralmodel_v = np.zeros(N, dtype=int)
-    dmin_min_v          = np.full(N, np.inf)
+
+    # Arm radii at the nearest points, all arms at once: (narms, N)
+    rjmin = model.eval_arm_radii_vec(thjmin)
 
     for j in range(narms):
         jj = arm_index[j]
         Wa = model.wa * warm[j]
         Ha = model.ha * harm[j]
 
-        # ---- Find thjmin for every position using grouped batch splines ----
-        thjmin_j = np.empty(N)
-
-        for k in np.unique(index_dsqmin[j]):
-            pos_k = np.where(index_dsqmin[j] == k)[0]   # indices into xvec
-            n_k   = pos_k.size
-            ind1  = range(max(0, k - nspline2 - 1),
-                          min(k + nspline2 + 1, Ncoarse), 1)
-            th_k  = th1[j, ind1]                         # (len_ind1,)
-
-            # dsq_k shape: (len_ind1, n_k)
-            dsq_k    = dsq_coarse[j][np.ix_(list(ind1), pos_k)]
-            thjfine  = np.arange(th_k[0], th_k[-1], dthfine)
-
-            if n_k == 1:
-                # Scalar path — identical to the original ne_arms_ne2001p
-                dsqs      = CubicSpline(th_k, dsq_k[:, 0])
-                fine_vals = dsqs(thjfine)                        # (len_fine,)
-                thjmin_j[pos_k[0]] = thjfine[fine_vals.argmin()]
-            else:
-                # Batch path: CubicSpline with 2-D y (columns = positions)
-                dsqs      = CubicSpline(th_k, dsq_k)            # y: (len_ind1, n_k)
-                fine_vals = dsqs(thjfine)                        # (len_fine, n_k)
-                thjmin_j[pos_k] = thjfine[fine_vals.argmin(axis=0)]
+        thjmin_j = thjmin[j]
 
         # Arm position and distance at nearest point
-        rjmin_j  = model.arm_radius_splines[j](thjmin_j)        # (N,)
+        rjmin_j  = rjmin[j]                                     # (N,)
         xjmin    = -rjmin_j * np.sin(thjmin_j)
         yjmin    =  rjmin_j * np.cos(thjmin_j)
         dmin_j   = np.sqrt((xvec - xjmin)**2 + (yvec - yjmin)**2)  # (N,)
 
-        # Initialise dmin_min on first arm (unconditional, mirroring scalar code)
-        if j == 0:
-            dmin_min_v[:] = dmin_j
-
         in_range = dmin_j < 3. * model.wa    # scalar threshold, same as original
 
-        # Track nearest arm
-        update_which       = in_range & (dmin_j <= dmin_min_v)
-        dmin_min_v         = np.where(update_which, dmin_j, dmin_min_v)
-        whicharm_spiralmodel_v = np.where(update_which, j + 1,
-                                          whicharm_spiralmodel_v)
+        if j == 0:
+            # dmin_min starts at the first arm's distance (unconditional,
+            # mirroring scalar code), so every in-range position takes arm 1
+            dmin_min_v = dmin_j
+            whicharm_spiralmodel_v = in_range.astype(int)
+        else:
+            # Track nearest arm (masked stores in place, no temporaries)
+            update_which = in_range & (dmin_j <= dmin_min_v)
+            np.copyto(dmin_min_v, dmin_j, where=update_which)
+            np.copyto(whicharm_spiralmodel_v, j + 1, where=update_which)
 
         # ---- Density factor ga (computed for all positions; masked at accumulation) ----
+        # arm-distance factor x Galactocentric radial factor x z factor
         argxy = dmin_j / Wa
         ga    = np.exp(-argxy**2)
-
-        # Galactocentric radial factor
-        ga = np.where(rr > model.Aa, ga * sech2((rr - model.Aa) / 2.), ga)
-
-        # z factor
-        ga = ga * sech2(zvec / Ha)
+        ga   *= fac_rr
+        ga   *= sech2(zvec / Ha)
 
         # Arm-specific angular adjustments
         if jj == 3:   # TC arm 3
-            th3adeg, th3bdeg = 290, 363
-            test3 = thxydeg - th3adeg
-            test3 = np.where(test3 < 0, test3 + 360., test3)
-            fac_cond = (test3 >= 0) & (test3 < th3bdeg - th3adeg)
-            arg_v    = 2. * np.pi * test3 / (th3bdeg - th3adeg)
-            fac      = ((1 + np.cos(arg_v)) / 2)**4
-            ga       = np.where(fac_cond, ga * fac, ga)
-
+            ga *= fac_arm3
         if jj == 2:   # TC arm 2
-            th2adeg, th2bdeg = 340, 370
-            fac2min = 0.1
-            test2   = thxydeg - th2adeg
-            test2   = np.where(test2 < 0, test2 + 360., test2)
-            fac_cond = (test2 >= 0) & (test2 < th2bdeg - th2adeg)
-            arg_v    = 2. * np.pi * test2 / (th2bdeg - th2adeg)
-            fac      = ((1 + fac2min + (1 - fac2min) * np.cos(arg_v)) / 2)**3.5
-            ga       = np.where(fac_cond, ga * fac, ga)
+            ga *= fac_arm2
 
         # Accumulate: only where point is within arm range
-        nea_v = np.where(in_range, nea_v + ga * narm[j] * model.na, nea_v)
+        np.add(nea_v, ga * narm[j] * model.na, out=nea_v, where=in_range)
 
-    # Map Wainscoat arm index to TC arm numbering (same as scalar Darmmap lookup)
-    arm_tc_map = np.zeros(narms + 1, dtype=int)   # index 0 → whicharm=0 (no arm)
-    for j in range(narms):
-        arm_tc_map[j + 1] = arm_index[j]
-    whicharm_v = arm_tc_map[whicharm_spiralmodel_v]
+    # Map Wainscoat arm index to TC arm numbering (same as scalar lookup)
+    whicharm_v = model.arm_tc_map[whicharm_spiralmodel_v]
 
     Farm_v = np.where(whicharm_spiralmodel_v != 0, model.Fa, 0.)
 
@@ -47,11 +47,11 @@ Version history:
 
 from mwprop.nemod.config_nemod import *
 import numpy as np
-from mwprop.nemod.numba_compat import njit, HAS_NUMBA
+from mwprop.nemod.numba_compat import njit, prange, HAS_NUMBA
 
 @njit
-def _nevoidN_jit(x, y, z, nvoids, xv, yv, zv, nev, Fv, aav, bbv, ccv,  # pragma: no cover
-                 edgev, cc12, s2, cs21, cs12, c2, ss12, s1, c1):
+def _nevoidN_jit(x, y, z, nvoids, xv, yv, zv, nev, Fv, edgev,  # pragma: no cover
+                 rv11, rv12, rv13, rv21, rv22, rv23, rv31, rv33):
     """JIT-compiled core loop for void calculation"""
     nevN = 0.
     FvN = 0.
@@ -62,9 +62,11 @@ def _nevoidN_jit(x, y, z, nvoids, xv, yv, zv, nev, Fv, aav, bbv, ccv,  # pragma:
         dx = x - xv[j]
         dy = y - yv[j]
         dz = z - zv[j]
-        q = ((cc12[j]*dx + s2[j]*dy + cs21[j]*dz)**2. / aav[j]**2. +
-             (-cs12[j]*dx + c2[j]*dy - ss12[j]*dz)**2. / bbv[j]**2. +
-             (-s1[j]*dx + c1[j]*dz)**2. / ccv[j]**2.)
+        # rotated coordinates in units of the void axes
+        u = rv11[j]*dx + rv12[j]*dy + rv13[j]*dz
+        v = rv21[j]*dx + rv22[j]*dy + rv23[j]*dz
+        w = rv31[j]*dx + rv33[j]*dz
+        q = u*u + v*v + w*w
         if edgev[j] == 0. and q < 3.:
             nevN = nev[j] * np.exp(-q)
             FvN = Fv[j]
@@ -79,6 +81,15 @@ def _nevoidN_jit(x, y, z, nvoids, xv, yv, zv, nev, Fv, aav, bbv, ccv,  # pragma:
 
     return nevN, FvN, hitvoid, wvoid
 
+@njit(parallel=True, cache=True, boundscheck=False)
+def _nevoidN_arr_jit(coords, nevN, FvN, hitvoid, nvoids, xv, yv, zv, nev, Fv,  # pragma: no cover
+                     edgev, rv11, rv12, rv13, rv21, rv22, rv23, rv31, rv33):
+    """_nevoidN_jit over (3, N) positions; fills nevN, FvN, hitvoid in place"""
+    for i in prange(coords.shape[1]):
+        nevN[i], FvN[i], hitvoid[i], _ = _nevoidN_jit(
+            coords[0, i], coords[1, i], coords[2, i], nvoids, xv, yv, zv, nev, Fv, edgev,
+            rv11, rv12, rv13, rv21, rv22, rv23, rv31, rv33)
+
 def nevoidN(x,y,z):
 
     nevN = 0.
@@ -90,46 +101,66 @@ def nevoidN(x,y,z):
         return nevN, FvN, hitvoid, wvoid
 
     # Call JIT-compiled core loop
-    return _nevoidN_jit(x, y, z, nvoids, xv, yv, zv, nev, Fv, aav, bbv, ccv,
-                        edgev, cc12, s2, cs21, cs12, c2, ss12, s1, c1)
+    return _nevoidN_jit(x, y, z, nvoids, xv, yv, zv, nev, Fv, edgev,
+                        rv11, rv12, rv13, rv21, rv22, rv23, rv31, rv33)
 
 
 # ---------------------------------------------------------------------------
 
+# Void centres, shape (nvoids, 3, 1), and rows (rv11, rv12, rv13),
+# (rv21, rv22, rv23), (rv31, 0, rv33) stacked as (nvoids, 3, 3) for the
+# NumPy version of nevoidN_vec
+_void_centres = np.stack((xv, yv, zv), axis=1)[:, :, np.newaxis]
+_void_rot = np.stack((np.stack((rv11, rv12, rv13), axis=1),
+                      np.stack((rv21, rv22, rv23), axis=1),
+                      np.stack((rv31, np.zeros_like(rv31), rv33), axis=1)),
+                     axis=1)
+
 def nevoidN_vec(x, y, z):
     """
     Vectorized (array) version of nevoidN.
 
     x, y, z are 1-D numpy arrays of positions.
-    Loops over the (few) voids; vectorizes over positions.
+    With numba, runs the scalar kernel over the positions in parallel.
+    Otherwise evaluates every void at every position as one (nvoids, N)
+    array (quadratic forms via a batched matmul, equal to the scalar ones
+    to rounding); as in the scalar loop, the last void hit wins.
 
     Returns (nevN_v, FvN_v, hitvoid_v, wvoid_v) — all 1-D arrays.
     """
     n = len(x)
-    nevN_v    = np.zeros(n)
-    FvN_v     = np.zeros(n)
-    hitvoid_v = np.zeros(n, dtype=int)
-
     if nvoids == 0:
-        return nevN_v, FvN_v, hitvoid_v, np.zeros(n)
-
-    for j in range(nvoids):
-        dx = x - xv[j]
-        dy = y - yv[j]
-        dz = z - zv[j]
-        q = ((cc12[j]*dx  + s2[j]*dy   + cs21[j]*dz)**2 / aav[j]**2
-           + (-cs12[j]*dx + c2[j]*dy   - ss12[j]*dz)**2 / bbv[j]**2
-           + (-s1[j]*dx                +  c1[j]*dz)**2   / ccv[j]**2)
-        if edgev[j] == 0.:              # Gaussian void
-            mask = q < 3.
-            nevN_v    = np.where(mask, nev[j] * np.exp(-q), nevN_v)
-            FvN_v     = np.where(mask, Fv[j],  FvN_v)
-            hitvoid_v = np.where(mask, j + 1,  hitvoid_v)
-        elif edgev[j] == 1.:            # hard-edge void
-            mask = q <= 1.
-            nevN_v    = np.where(mask, nev[j], nevN_v)
-            FvN_v     = np.where(mask, Fv[j],  FvN_v)
-            hitvoid_v = np.where(mask, j + 1,  hitvoid_v)
-
-    wvoid_v = (hitvoid_v != 0).astype(float)
+        return np.zeros(n), np.zeros(n), np.zeros(n, dtype=int), np.zeros(n)
+
+    if HAS_NUMBA:
+        nevN_v    = np.empty(n)
+        FvN_v     = np.empty(n)
+        hitvoid_v = np.empty(n, dtype=int)
+        _nevoidN_arr_jit(stack_coords(x, y, z), nevN_v, FvN_v, hitvoid_v,
+                         nvoids, xv, yv, zv, nev, Fv, edgev, rv11, rv12, rv13,
+                         rv21, rv22, rv23, rv31, rv33)
+        return nevN_v, FvN_v, hitvoid_v, (hitvoid_v != 0).astype(float)
+
+    # (nvoids, 3, N) offsets from each void centre, rotated and scaled to
+    # the void axes in one batched matmul; q is the squared length
+    d = stack_coords(x, y, z)[np.newaxis] - _void_centres
+    u = _void_rot @ d
+    q = np.einsum('vkn,vkn->vn', u, u)
+
+    gauss = (edgev == 0.)[:, np.newaxis]        # Gaussian voids
+    hard  = (edgev == 1.)[:, np.newaxis]        # hard-edge voids
+    valid = (gauss & (q < 3.)) | (hard & (q <= 1.))
+    nev_vals = np.where(gauss, nev[:, np.newaxis] * np.exp(-q),
+                        nev[:, np.newaxis])
+
+    # Last void hit at each position
+    any_hit = valid.any(axis=0)
+    hit = nvoids - 1 - np.argmax(valid[::-1], axis=0)
+
+    nevN_v = np.where(any_hit,
+                      np.take_along_axis(nev_vals, hit[np.newaxis], axis=0)[0],
+                      0.)
+    FvN_v     = np.where(any_hit, Fv[hit], 0.)
+    hitvoid_v = np.where(any_hit, hit + 1, 0)
+    wvoid_v   = any_hit.astype(float)
     return nevN_v, FvN_v, hitvoid_v, wvoid_v
@@ -9,17 +9,25 @@ the performance benefits of JIT compilation.
 """
 
 try:
-    from numba import njit
+    from numba import njit, prange
     HAS_NUMBA = True
 except ImportError:
     HAS_NUMBA = False
+    def _plain(func):
+        # Return func itself (no wrapper), with the dispatcher attributes
+        # that calling code may inspect
+        func.signatures = ()
+        func.py_func = func
+        return func
+
     def njit(*args, **kwargs):
         """Dummy decorator when numba unavailable"""
-        def decorator(func):
-            return func
         # Handle @njit (called with function) vs @njit() (called with args)
         if len(args) == 1 and callable(args[0]) and not kwargs:
-            return args[0]
-        return decorator
+            return _plain(args[0])
+        return _plain
+
+    # Plain range stands in for numba's parallel range
+    prange = range
 
-__all__ = ['njit', 'HAS_NUMBA']
+__all__ = ['njit', 'prange', 'HAS_NUMBA']
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from mwprop.nemod import config_nemod
+from mwprop.nemod.density_components import ne_outer, ne_inner, ne_gc, ne_all_comps
+
+
+# Grid spanning the GC region, the thin-disk annulus, the solar circle and
+# points well above the plane.
+POINTS = [
+    (x, y, z)
+    for x in (-10.0, -0.05, 0.0, 0.02, 3.0, 12.0)
+    for y in (-4.0, -0.01, 0.0, 0.03, 4.0, 8.5, 18.0)
+    for z in (-3.0, -0.01, -0.005, 0.0, 0.02, 1.5)
+]
+
+
+def test_ne_all_comps_matches_separate_components():
+    for x, y, z in POINTS:
+        ne1, F1, ne2, F2, negc, Fgc = ne_all_comps(x, y, z)
+
+        assert (ne1, F1) == pytest.approx(ne_outer(x, y, z), rel=1e-12, abs=1e-15)
+        assert (ne2, F2) == pytest.approx(ne_inner(x, y, z), rel=1e-12, abs=1e-15)
+        assert (negc, Fgc) == pytest.approx(ne_gc(x, y, z))
+
+
+def test_ne_all_comps_at_gc_center():
+    ne1, F1, ne2, F2, negc, Fgc = ne_all_comps(
+        config_nemod.xgc, config_nemod.ygc, config_nemod.zgc)
+
+    assert negc == pytest.approx(config_nemod.negc0)
+    assert Fgc == pytest.approx(config_nemod.Fgc0)
+
+
+def test_float32_variants_match_float64():
+    from mwprop.nemod.density_components import (
+        ne_outer_vec, ne_inner_vec, ne_outer32, ne_inner32,
+    )
+
+    xg, yg, zg = np.meshgrid(np.linspace(-20., 20., 31),
+                             np.linspace(-20., 20., 31),
+                             np.linspace(-3., 3., 13))
+    x, y, z = xg.ravel(), yg.ravel(), zg.ravel()
+
+    for f64, f32 in ((ne_outer_vec, ne_outer32), (ne_inner_vec, ne_inner32)):
+        ne, F = f64(x, y, z)
+        ne_s, F_s = f32(x, y, z)
+        assert ne_s.dtype == np.float32 and F_s.dtype == np.float32
+        np.testing.assert_allclose(ne_s, ne, rtol=2e-5, atol=1e-9)
+        np.testing.assert_allclose(F_s, F, rtol=1e-7)
+
+
+def test_float32_sech2_lookup_table():
+    from mwprop.nemod.density_components import ne_outer32, ne_inner32
+
+    rng = np.random.default_rng(3)
+    x, y = rng.uniform(-15., 15., (2, 5000))
+    z = rng.uniform(-4., 4., 5000)
+
+    for f32 in (ne_outer32, ne_inner32):
+        ne_exact = f32(x, y, z)[0]
+        ne_lut, F_lut = f32(x, y, z, lut=True)
+        assert ne_lut.dtype == np.float32
+        np.testing.assert_allclose(ne_lut, ne_exact, rtol=1e-5,
+                                   atol=1e-9*ne_exact.max())
+
+
+def test_cos_polynomial_on_quarter_period():
+    from mwprop.nemod.density_components import _cos_cheb
+
+    for t in np.linspace(0., np.pi/2, 1001):
+        assert _cos_cheb(t) == pytest.approx(np.cos(t), rel=0, abs=5e-15)
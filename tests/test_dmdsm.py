@@ -256,3 +256,46 @@ def test_dmdsm_d2dm_full_expected():
     assert smtau == pytest.approx(0.024011327959735037, rel=1e-12, abs=1e-12)
     assert smtheta == pytest.approx(0.003986103883985816, rel=1e-12, abs=1e-12)
     assert smiso == pytest.approx(0.13014730079324685, rel=1e-12, abs=1e-12)
+
+
+def test_dm_cumulate_matches_cumulative_trapezoid():
+    from scipy.integrate import cumulative_trapezoid
+    from mwprop.nemod.config_nemod import pc_in_kpc
+    from mwprop.nemod.dmdsm import dm_cumulate
+
+    rng = np.random.default_rng(7)
+    ne = rng.uniform(0.0, 0.5, 1001)
+    dx = 0.0123
+
+    expected = pc_in_kpc * cumulative_trapezoid(ne, dx=dx, initial=0.0)
+    np.testing.assert_array_equal(dm_cumulate(ne, dx), expected)
+
+
+def test_calc_galcentric_vecs_share_one_coords_buffer():
+    from mwprop.nemod.config_nemod import rsun, stack_coords
+    from mwprop.nemod.dmdsm import calc_galcentric_vecs
+
+    l, b = deg2rad(30.0), deg2rad(5.0)
+    s, x, y, z = calc_galcentric_vecs(l, b, 10.0, 101)
+
+    # The array kernels get the LoS buffer itself, not a copy
+    coords = stack_coords(x, y, z)
+    assert coords is x.base
+    assert coords.shape == (3, 101) and coords.flags.c_contiguous
+    np.testing.assert_array_equal(x, s*np.cos(b)*np.sin(l))
+    np.testing.assert_array_equal(y, rsun - s*np.cos(b)*np.cos(l))
+    np.testing.assert_array_equal(z, s*np.sin(b))
+
+
+def test_stack_coords_copies_separate_arrays():
+    from mwprop.nemod.config_nemod import stack_coords
+
+    x, y, z = np.arange(4.), np.arange(4.) + 10., np.arange(4) - 3
+    coords = stack_coords(x, y, z)
+    assert coords.dtype == np.float64 and coords.flags.c_contiguous
+    np.testing.assert_array_equal(coords, [x, y, z])
+    # Rows of a buffer in another order are copied too
+    buf = np.stack((x, y, z.astype(float)))
+    assert stack_coords(buf[0], buf[1], buf[2]) is buf
+    np.testing.assert_array_equal(stack_coords(buf[1], buf[0], buf[2]),
+                                  buf[[1, 0, 2]])
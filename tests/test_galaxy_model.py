@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from mwprop.nemod.galaxy_model import default_model
+
+
+def test_galaxy_model_arm_arrays_are_contiguous_float64():
+    for name in ("warm", "harm", "narm"):
+        arr = getattr(default_model, name)
+        assert arr.dtype == np.float64
+        assert arr.flags.c_contiguous
+        assert arr.shape == (default_model.narms,)
+
+
+def test_eval_arm_radii_matches_arm_splines():
+    splines = default_model.arm_radius_splines
+    # Interior points, the first/last breakpoints and slight extrapolation
+    for frac in (-0.01, 0.0, 0.137, 0.5, 0.861, 1.0, 1.01):
+        theta = np.array([spl.x[0] + frac*(spl.x[-1] - spl.x[0]) for spl in splines])
+        expected = np.array([spl(theta[j]) for j, spl in enumerate(splines)])
+        np.testing.assert_allclose(default_model.eval_arm_radii(theta), expected,
+                                   rtol=1e-13, atol=0)
+
+
+def test_eval_arm_radii_vec_matches_arm_splines():
+    splines = default_model.arm_radius_splines
+    rng = np.random.default_rng(0)
+    # Random angles plus every knot, its neighbours in floating point, and
+    # points beyond both ends
+    theta = []
+    for spl in splines:
+        lo, hi = spl.x[0], spl.x[-1]
+        t = np.concatenate((rng.uniform(lo - 0.05, hi + 0.05, 500), spl.x,
+                            np.nextafter(spl.x, -np.inf),
+                            np.nextafter(spl.x, np.inf)))
+        theta.append(t)
+    theta = np.array(theta)
+    expected = np.array([spl(theta[j]) for j, spl in enumerate(splines)])
+    np.testing.assert_array_equal(default_model.eval_arm_radii_vec(theta), expected)
+
+
+def test_darmmap_int_keys_accept_legacy_str_keys():
+    from mwprop.nemod.config_nemod import Darmmap
+
+    assert all(isinstance(k, int) for k in Darmmap)
+    for j in range(default_model.narms):
+        assert Darmmap[str(j)] == Darmmap[j] == default_model.arm_index[j]
+        assert str(j) in Darmmap
+        assert default_model.arm_tc_map[j + 1] == Darmmap[j]
+    assert default_model.arm_tc_map[0] == 0
+    with pytest.raises(KeyError):
+        Darmmap[default_model.narms]
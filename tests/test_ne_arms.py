@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from scipy.interpolate import CubicSpline
+
+from mwprop.nemod.config_nemod import coarse_arms, th1, Ncoarse
+from mwprop.nemod import ne_arms
+
+
+def _coarse_inputs(n=2000, seed=1):
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(-15., 15., n)
+    y = rng.uniform(-15., 20., n)
+    dsq = ((coarse_arms[0, :, :, np.newaxis] - x)**2
+           + (coarse_arms[1, :, :, np.newaxis] - y)**2)
+    return x, y, dsq, np.argmin(dsq, axis=1)
+
+
+def _refine_reference(dsq, index_dsqmin, nspline2, dthfine):
+    # One CubicSpline per arm and position, as in ne_arms_ne2001p
+    narms, N = index_dsqmin.shape
+    thjmin = np.empty((narms, N))
+    for j in range(narms):
+        for i in range(N):
+            k = index_dsqmin[j, i]
+            ind1 = range(max(0, k - nspline2 - 1), min(k + nspline2 + 1, Ncoarse))
+            thjfine = np.arange(th1[j, ind1[0]], th1[j, ind1[-1]], dthfine)
+            dsqs = CubicSpline(th1[j, ind1], dsq[j, ind1, i])
+            thjmin[j, i] = thjfine[dsqs(thjfine).argmin()]
+    return thjmin
+
+
+@pytest.mark.parametrize("nfinespline", [3, 5, 7])
+def test_arm_refine_matches_cubic_splines(nfinespline):
+    x, y, dsq, index_dsqmin = _coarse_inputs(n=400)
+    nspline2 = int((nfinespline - 1)/2)
+    # Stencils touching both ends of the arms (3- and 4-point splines) occur
+    assert (index_dsqmin == 0).any() and (index_dsqmin == Ncoarse-1).any()
+
+    expected = _refine_reference(dsq, index_dsqmin, nspline2, 0.01)
+    for refine in (ne_arms._arm_refine_jit, ne_arms._arm_refine_splines):
+        thjmin = refine(th1, coarse_arms, x, y, index_dsqmin, nspline2, 0.01)
+        np.testing.assert_allclose(thjmin, expected, rtol=0, atol=1e-12)
+
+
+def test_ne_arms_core_matches_python_loop(monkeypatch):
+    rng = np.random.default_rng(2)
+    pts = np.column_stack((rng.uniform(-12., 12., 60), rng.uniform(-12., 16., 60),
+                           rng.uniform(-1., 1., 60)))
+    compiled = [ne_arms.ne_arms_ne2001p(x, y, z) for x, y, z in pts]
+    monkeypatch.setattr(ne_arms, 'HAS_NUMBA', False)
+    python = [ne_arms.ne_arms_ne2001p(x, y, z) for x, y, z in pts]
+    assert any(w != 0 for _, _, w in python)
+    for (nea_c, F_c, w_c), (nea_p, F_p, w_p) in zip(compiled, python):
+        assert w_c == w_p and F_c == F_p
+        assert nea_c == pytest.approx(nea_p, rel=1e-12, abs=1e-300)
+
+
+def test_coarse_argmin_matches_float64_argmin():
+    x, y, dsq, index_dsqmin = _coarse_inputs(n=5000, seed=3)
+    np.testing.assert_array_equal(ne_arms._coarse_argmin(x, y), index_dsqmin)
+
+
+def test_coarse_argmin_resolves_arm_end_ties():
+    # Points on the perpendicular bisector of the two ends of each arm are
+    # (near-)equidistant from samples ~340 deg apart, which float32 cannot
+    # order
+    narms, nsamp = coarse_arms.shape[1:]
+    t = np.linspace(-20., 20., 401)
+    x, y = [], []
+    for j in range(narms):
+        for k1, k2 in ((0, nsamp - 1), (1, nsamp - 2), (0, nsamp // 2)):
+            p1, p2 = coarse_arms[:, j, k1], coarse_arms[:, j, k2]
+            d = (p2 - p1)/np.hypot(*(p2 - p1))
+            x.append((p1[0] + p2[0])/2 - t*d[1])
+            y.append((p1[1] + p2[1])/2 + t*d[0])
+    x, y = np.concatenate(x), np.concatenate(y)
+    dsq = ((coarse_arms[0, :, :, np.newaxis] - x)**2
+           + (coarse_arms[1, :, :, np.newaxis] - y)**2)
+    np.testing.assert_array_equal(ne_arms._coarse_argmin(x, y),
+                                  np.argmin(dsq, axis=1))
+
+
+def test_ncoarse_argument_is_deprecated_and_ignored():
+    x, y, z = np.array([1.0, -4.0]), np.array([2.0, 7.5]), np.array([0.1, -0.2])
+    expected = ne_arms.ne_arms_ne2001p_vec(x, y, z)
+    # The old default of 20 disagreed with the 50-sample coarse arms
+    with pytest.warns(DeprecationWarning):
+        got = ne_arms.ne_arms_ne2001p_vec(x, y, z, Ncoarse=20)
+    for g, e in zip(got, expected):
+        np.testing.assert_array_equal(g, e)
+    with pytest.warns(DeprecationWarning):
+        assert ne_arms.ne_arms_ne2001p(1.0, 2.0, 0.1, Ncoarse=20) == \
+            ne_arms.ne_arms_ne2001p(1.0, 2.0, 0.1)
@@ -1,7 +1,8 @@
+import numpy as np
 import pytest
 
 from mwprop.nemod import config_nemod
-from mwprop.nemod.density_components import ne_gc
+from mwprop.nemod.density_components import ne_gc, ne_gc_vec
 
 
 def test_ne_gc_at_center():
@@ -16,4 +17,18 @@ def test_ne_gc_far_from_center():
     ne_gc_out, F_gc = ne_gc(config_nemod.xgc, far_y, config_nemod.zgc)
 
     assert ne_gc_out == 0
-    assert F_gc == 0
\ No newline at end of file
+    assert F_gc == 0
+
+
+def test_ne_gc_matches_vectorized_version():
+    # Samples straddling the edges of the GC ellipsoid in every coordinate
+    g = np.linspace(-1.5, 1.5, 7)
+    gx, gy, gz = [a.ravel() for a in np.meshgrid(g, g, g)]
+    x = config_nemod.xgc + config_nemod.rgc * gx
+    y = config_nemod.ygc + config_nemod.rgc * gy
+    z = config_nemod.zgc + config_nemod.hgc * gz
+    negc_v, Fgc_v = ne_gc_vec(x, y, z)
+    assert 0 < np.count_nonzero(negc_v) < x.size
+
+    for i in range(x.size):
+        assert ne_gc(x[i], y[i], z[i]) == (negc_v[i], Fgc_v[i])
@@ -1,7 +1,9 @@
+import numpy as np
 import pytest
 
 from mwprop.nemod import config_nemod
-from mwprop.nemod.nevoidN import nevoidN
+from mwprop.nemod import nevoidN as nevoidN_mod
+from mwprop.nemod.nevoidN import nevoidN, nevoidN_vec
 
 
 def test_nevoidN_hits_void_center():
@@ -17,4 +19,26 @@ def test_nevoidN_hits_void_center():
     assert hitvoid == 1
     assert wvoid == 1
     assert nevN == pytest.approx(config_nemod.nev[0])
-    assert FvN == pytest.approx(config_nemod.Fv[0])
\ No newline at end of file
+    assert FvN == pytest.approx(config_nemod.Fv[0])
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_nevoidN_vec_matches_scalar(monkeypatch, use_numba):
+    if config_nemod.nvoids == 0:
+        pytest.skip("No voids defined in model parameters.")
+
+    # Points around every void centre, so that hits and misses both occur
+    rng = np.random.default_rng(0)
+    x = np.repeat(config_nemod.xv, 20) + rng.normal(0., 0.5, 20*config_nemod.nvoids)
+    y = np.repeat(config_nemod.yv, 20) + rng.normal(0., 0.5, 20*config_nemod.nvoids)
+    z = np.repeat(config_nemod.zv, 20) + rng.normal(0., 0.2, 20*config_nemod.nvoids)
+
+    monkeypatch.setattr(nevoidN_mod, 'HAS_NUMBA', use_numba and nevoidN_mod.HAS_NUMBA)
+    vec = nevoidN_vec(x, y, z)
+    expected = np.array([nevoidN(*p) for p in zip(x, y, z)]).T
+    assert (vec[2] != 0).any() and (vec[2] == 0).any()
+    np.testing.assert_array_equal(vec[2], expected[2])
+    np.testing.assert_array_equal(vec[3], expected[3])
+    np.testing.assert_array_equal(vec[1], expected[1])
+    # The NumPy version sums the quadratic form in a different order
+    np.testing.assert_allclose(vec[0], expected[0], rtol=1e-12, atol=0)
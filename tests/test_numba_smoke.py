@@ -28,4 +28,52 @@ def test_numba_smoke_density_components():
     ne_inner(0.1, 0.2, 0.0)
 
     assert _ne_outer_jit.signatures, "Expected numba to compile _ne_outer_jit"
-    assert _ne_inner_jit.signatures, "Expected numba to compile _ne_inner_jit"
\ No newline at end of file
+    assert _ne_inner_jit.signatures, "Expected numba to compile _ne_inner_jit"
+
+
+def test_numba_smoke_density_components_arrays():
+    pytest.importorskip("numba")
+
+    import numpy as np
+    from mwprop.nemod.density_components import (
+        ne_outer, ne_inner, ne_outer_vec, ne_inner_vec,
+        _ne_outer_arr_jit, _ne_inner_arr_jit,
+    )
+
+    x = np.linspace(-12.0, 12.0, 41)
+    y = np.linspace(-3.0, 15.0, 41)
+    z = np.linspace(-2.0, 2.0, 41)
+
+    ne1_v, F1_v = ne_outer_vec(x, y, z)
+    ne2_v, F2_v = ne_inner_vec(x, y, z)
+
+    assert _ne_outer_arr_jit.signatures, "Expected numba to compile _ne_outer_arr_jit"
+    assert _ne_inner_arr_jit.signatures, "Expected numba to compile _ne_inner_arr_jit"
+
+    for i in range(x.size):
+        ne1, F1 = ne_outer(x[i], y[i], z[i])
+        ne2, F2 = ne_inner(x[i], y[i], z[i])
+        assert ne1_v[i] == pytest.approx(ne1, rel=1e-12, abs=1e-15)
+        assert ne2_v[i] == pytest.approx(ne2, rel=1e-12, abs=1e-15)
+        assert F1_v[i] == F1
+        assert F2_v[i] == F2
+
+
+def test_njit_fallback_returns_plain_function(monkeypatch):
+    import importlib.util
+    import sys
+
+    # Load a private copy of numba_compat with numba made unimportable
+    monkeypatch.setitem(sys.modules, "numba", None)
+    spec = importlib.util.find_spec("mwprop.nemod.numba_compat")
+    compat = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(compat)
+    assert not compat.HAS_NUMBA
+
+    def f(x):
+        return 2*x
+
+    for deco in (compat.njit, compat.njit(cache=True, fastmath=True)):
+        g = deco(f)
+        assert g is f and g(3) == 6
+        assert g.py_func is f and g.signatures == ()
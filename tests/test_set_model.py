@@ -47,3 +47,15 @@ def test_set_model_propagates_to_density_components():
 
     # Restore default model for downstream tests
     config_nemod.set_model("ne2025")
+
+
+def test_density_components_reference_follows_set_model():
+    from mwprop.nemod import density_components
+
+    config_nemod.set_model("ne2001")
+    ne_outer = density_components.ne_outer
+    ne1_2001 = ne_outer(0.5, 2.0, 0.1)[0]
+
+    config_nemod.set_model("ne2025")
+    assert ne_outer(0.5, 2.0, 0.1)[0] != pytest.approx(ne1_2001)
+    assert ne_outer(0.5, 2.0, 0.1) == density_components.ne_outer(0.5, 2.0, 0.1)
@@ -3,7 +3,6 @@ Regression tests for smooth-component helpers prior to performance optimizations
 """
 import pytest
 
-from mwprop.nemod.config_nemod import Ncoarse
 from mwprop.nemod.ne_arms import ne_arms_ne2001p
 from mwprop.nemod.density import density_2001_smooth_comps
 
@@ -95,7 +94,7 @@ SMOOTH_COMP_DATASETS = [
 )
 def test_ne_arms_ne2001p_regression(dataset):
     x, y, z = dataset["point"]
-    nea, F, whicharm = ne_arms_ne2001p(x, y, z, Ncoarse=Ncoarse)
+    nea, F, whicharm = ne_arms_ne2001p(x, y, z)
 
     assert nea == pytest.approx(dataset["nea"], rel=1e-12, abs=1e-12)
     assert F == pytest.approx(dataset["F"], rel=1e-12, abs=1e-12)